@@ -0,0 +1,125 @@
+"""
+StreamForge Async Engine - asyncio API for embedding in bots and web services
+"""
+import asyncio
+from collections import namedtuple
+
+from streamforge import StreamForge, SEARCH_WORKERS
+
+# ==========================================
+# 🌀 ASYNC ENGINE (For embedding)
+# ==========================================
+# ytmusicapi is blocking, so every request still runs on a worker thread;
+# this layer bounds how many are in flight, streams results back as they
+# finish, and never prints.
+class TrackResult(namedtuple("TrackResult", "index line status video_id latency")):
+    """
+    One resolved input line.
+
+    status is "direct", "resolved", "missed", "skipped" or "dropped" (a dead
+    direct ID with nothing searchable around it), as in execute() events.
+    """
+    __slots__ = ()
+
+class AsyncStreamForge:
+    """
+    asyncio front end to StreamForge for bots and web services.
+
+        forge = await AsyncStreamForge.connect()
+        async for result in forge.resolve(lines):
+            ...
+        pl_id = await forge.create("Title", ids)
+
+    Searches share the engine's cache, rate limiter and run history, so a
+    long-lived instance keeps getting cheaper.
+    """
+    def __init__(self, forge, concurrency=SEARCH_WORKERS):
+        self.forge = forge
+        self.concurrency = max(1, concurrency)
+
+    @classmethod
+    async def connect(cls, concurrency=SEARCH_WORKERS, watch_auth=True):
+        """Build a quiet StreamForge off the event loop. Raises if auth is missing or bad."""
+        forge = await asyncio.to_thread(StreamForge, watch_auth=watch_auth, quiet=True)
+        return cls(forge, concurrency)
+
+    async def resolve(self, lines, validate=True):
+        """
+        Resolve lines (text or Track entries), yielding a TrackResult per
+        non-blank line in completion order; use result.index to restore
+        input order.
+
+        Free results (direct IDs, skipped lines, cache hits) come first,
+        then searches, cheapest first, at most `concurrency` at a time.
+        Breaking out of the loop or cancelling the consuming task stops
+        further searches; a search already on the wire still finishes in
+        its thread. Search errors are raised from the iterator.
+        """
+        forge = self.forge
+        # SmartParser is CPU-bound; keep it off the event loop
+        lines, entries = await asyncio.to_thread(forge._classify_all, lines)
+
+        bad_ids = set()
+        ids = [vid for vid, _ in entries if vid]
+        if validate and ids:
+            bad_ids = await asyncio.to_thread(forge.validate_ids, ids)
+
+        free, tasks = await asyncio.to_thread(self._plan, lines, entries, bad_ids)
+        for result in free:
+            yield result
+        del free
+        if not tasks:
+            return
+        queue = iter(tasks)
+        results = asyncio.Queue()
+
+        async def worker():
+            # The shared iterator hands each task to exactly one worker
+            for _, index, query, dead_id in queue:
+                try:
+                    _, vid, _, latency = await asyncio.to_thread(forge._resolve, query)
+                except Exception as e:
+                    await results.put(e)
+                    return
+                status = "resolved" if vid else ("dropped" if dead_id else "missed")
+                await results.put(TrackResult(index, str(lines[index]), status, vid, latency))
+
+        workers = [asyncio.create_task(worker())
+                   for _ in range(min(self.concurrency, len(tasks)))]
+        try:
+            for _ in range(len(tasks)):
+                result = await results.get()
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def _plan(self, lines, entries, bad_ids):
+        """
+        Triage lines (on a worker thread). Returns (TrackResults that need no
+        request, [(expected cost, index, query, dead ID)] cheapest first).
+        """
+        forge = self.forge
+        free = []
+        searches = []
+        for index, line, status, vid, query in forge._triage(lines, entries, bad_ids):
+            if status is None:
+                searches.append((index, query, vid))
+            else:
+                free.append(TrackResult(index, line, status, None if status == "dropped" else vid, 0.0))
+        costs = forge.expected_costs(query for _, query, _ in searches)
+        return free, sorted((cost, *search) for cost, search in zip(costs, searches))
+
+    async def create(self, title, video_ids, description="Generated via StreamForge", privacy="PUBLIC"):
+        """Create the playlist and return its ID. API errors are raised, not printed."""
+        video_ids = [vid for vid in video_ids if vid]
+        if not video_ids:
+            raise ValueError("No valid tracks")
+        yt = self.forge.yt
+        return await asyncio.to_thread(yt.create_playlist, title, description, privacy, video_ids)
+
+    def close(self):
+        self.forge.close()
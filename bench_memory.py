@@ -0,0 +1,172 @@
+"""
+StreamForge Memory Benchmark - Peak RSS of a full execute() run
+
+Drives StreamForge.execute over a generated list against an in-process
+fake YTMusic (no network, no rate limit), each size in a fresh
+subprocess, and reports peak resident memory. Your real config dir is
+never touched.
+
+    python bench_memory.py
+    python bench_memory.py --lines 100000 1000000
+    python bench_memory.py --rev 416b6bf      # the pre-ResultStore engine
+    python bench_memory.py --warm             # reuse one config dir
+
+--rev runs the same harness against another commit's code (via git
+archive), so before/after comparisons can be reproduced. --warm shares a
+config dir across every run, and each size runs twice, so the cost of
+loading the ID cache and run history at init shows up.
+
+Reference numbers (Linux, CPython 3.11, cold config dir):
+
+    engine                         lines    execute MB    secs
+    416b6bf (list of dicts)      100,000         194.5     5.8
+                               1,000,000        1989.2    63.4
+    ef889e4 (ResultStore)        100,000          54.1     3.7
+                               1,000,000         566.8    36.5
+"""
+import argparse
+import contextlib
+import os
+import resource
+import subprocess
+import sys
+import shutil
+import tempfile
+import time
+
+
+# ==========================================
+# 🎭 FAKE API
+# ==========================================
+class FakeYTMusic:
+    """Answers like ytmusicapi, with full-sized result dicts, but instantly."""
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def search(self, query, filter=None, limit=1):
+        if query.endswith("(unreleased)"):
+            return []
+        if filter == "songs" and query.endswith("(live)"):
+            return []
+        n = abs(hash(query))
+        return [{
+            "category": "Songs",
+            "resultType": "song" if filter == "songs" else "video",
+            "title": query.split(" - ")[-1],
+            "album": {"name": "Album", "id": f"MPREb_{n % 10**12:012d}"},
+            "artists": [{"name": query.split(" - ")[0], "id": f"UC{n % 10**22:022d}"}],
+            "duration": "3:33",
+            "duration_seconds": 213,
+            "isExplicit": False,
+            "videoId": f"{n % 10**11:011d}",
+            "videoType": "MUSIC_VIDEO_TYPE_ATV",
+            "thumbnails": [{"url": f"https://lh3.googleusercontent.com/{n}=w{w}-h{w}", "width": w, "height": w}
+                           for w in (60, 120)],
+        }]
+
+    def get_song(self, video_id):
+        return {"playabilityStatus": {"status": "ERROR" if video_id.endswith("0") else "OK"}}
+
+    def create_playlist(self, title, description, privacy_status, video_ids):
+        return f"PL{len(video_ids)}"
+
+
+# ==========================================
+# 🏭 CORPUS
+# ==========================================
+def make_lines(n):
+    """Mostly pasted text, some links, a few misses and fallbacks."""
+    lines = []
+    for i in range(n):
+        kind = i % 20
+        if kind < 15:
+            lines.append(f"{i}. Artist {i % 5000} - Song Number {i} (Official Video)")
+        elif kind < 18:
+            lines.append(f"https://www.youtube.com/watch?v={i:011d}&list=PLbench")
+        elif kind == 18:
+            lines.append(f"Artist {i % 5000} - Song Number {i} (live)")
+        else:
+            lines.append(f"Artist {i % 5000} - Song Number {i} (unreleased)")
+    return lines
+
+
+# ==========================================
+# ⏱️ RUNNER
+# ==========================================
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def child(n, home, code_dir):
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home or tempfile.mkdtemp(prefix="sf-bench-")
+    sys.path.insert(0, code_dir)
+    import streamforge
+
+    streamforge.YTMusic = FakeYTMusic
+    os.makedirs(streamforge.get_config_dir(), exist_ok=True)
+    with open(streamforge.get_headers_path(), "w") as f:
+        f.write("{}")
+
+    lines = make_lines(n)
+    base = peak_rss_mb()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        forge = streamforge.StreamForge(watch_auth=False)
+        init_secs = time.perf_counter() - started
+        init = peak_rss_mb()
+        forge.limiter = streamforge.RateLimiter(1e9)
+        started = time.perf_counter()
+        pl_id = forge.execute("Bench", lines)
+        elapsed = time.perf_counter() - started
+    print(f"{n} {base:.1f} {init:.1f} {init_secs:.2f} {peak_rss_mb():.1f} {elapsed:.1f} {pl_id}")
+
+def export_rev(rev):
+    """Unpack the .py files of a commit into a temp dir and return it."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    dest = tempfile.mkdtemp(prefix="sf-bench-rev-")
+    archive = subprocess.run(["git", "-C", root, "archive", rev, "--", "*.py"],
+                             capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", dest], input=archive, check=True)
+    return dest
+
+def main():
+    parser = argparse.ArgumentParser(description="StreamForge execute() peak-RSS benchmark")
+    parser.add_argument("--lines", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--rev", help="benchmark the code at this git revision instead of the working tree")
+    parser.add_argument("--warm", action="store_true",
+                        help="share one config dir (ID cache, history) across runs; each size runs twice")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--home", help=argparse.SUPPRESS)
+    parser.add_argument("--code", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child, args.home, args.code)
+        return
+
+    code_dir = export_rev(args.rev) if args.rev else os.path.dirname(os.path.abspath(__file__))
+    home = tempfile.mkdtemp(prefix="sf-bench-") if args.warm else None
+    runs = 2 if args.warm else 1
+
+    print(f"{'lines':>9} {'run':>4} {'input MB':>9} {'init MB':>8} {'init s':>7} "
+          f"{'execute MB':>11} {'secs':>7}   playlist")
+    print("-" * 76)
+    try:
+        for n in args.lines:
+            for run in range(1, runs + 1):
+                cmd = [sys.executable, os.path.abspath(__file__), "--child", str(n), "--code", code_dir]
+                if home:
+                    cmd += ["--home", home]
+                out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.split()
+                lines, base, init, init_secs, peak, secs, pl_id = out
+                print(f"{int(lines):>9,} {run:>4} {float(base):>9.1f} {float(init) - float(base):>8.1f} "
+                      f"{float(init_secs):>7.2f} {float(peak) - float(init):>11.1f} {float(secs):>7.1f}   {pl_id}")
+    finally:
+        if args.rev:
+            shutil.rmtree(code_dir, ignore_errors=True)
+        if home:
+            shutil.rmtree(home, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
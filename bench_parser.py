@@ -0,0 +1,263 @@
+"""
+SmartParser Benchmark - Throughput and regression checks for the text parsers
+
+Runs SmartParser (the same extract-ID-then-sanitize pipeline execute() uses)
+and parse_curl_command over a generated multi-format corpus, reporting
+lines/sec and the worst single-line time per format.
+
+    python bench_parser.py
+    python bench_parser.py --lines 50000 --repeat 5
+
+Exits non-zero if any format falls below its throughput floor, any single
+line exceeds its time ceiling, or a regression case changes output.
+"""
+import argparse
+import gc
+import random
+import string
+import sys
+import time
+
+from streamforge import SmartParser, parse_curl_command
+
+
+# ==========================================
+# 📏 THRESHOLDS
+# ==========================================
+# Deliberately loose (roughly 10x below a laptop run) so they only trip on
+# real regressions such as a backtracking regex, not on a slow CI box.
+MIN_LINES_PER_SEC = {
+    "spotify": 5_000,
+    "numbered": 5_000,
+    "urls": 5_000,
+    "adversarial": 50,
+    "curl": 500,
+}
+MAX_LINE_MS = {
+    "spotify": 5,
+    "numbered": 5,
+    "urls": 5,
+    "adversarial": 100,
+    "curl": 100,
+}
+
+
+# ==========================================
+# 🧪 REGRESSION CORPUS
+# ==========================================
+# (input line, expected direct ID, expected sanitized query)
+REGRESSION_CASES = [
+    ("Blue Oyster Cult - (Don't Fear) The Reaper", None, "Blue Oyster Cult - (Don't Fear) The Reaper"),
+    ("1. Queen - Bohemian Rhapsody (Official Video)", None, "Queen - Bohemian Rhapsody"),
+    ("12) Daft Punk - One More Time [Official Audio] [3:55]", None, "Daft Punk - One More Time"),
+    ("Nirvana - Smells Like Teen Spirit [HD Remastered] (5:01)", None, "Nirvana - Smells Like Teen Spirit"),
+    ("Tool - Lateralus (Lyrics) (Visualizer)", None, "Tool - Lateralus"),
+    ("Artist - Song (feat. Someone)", None, "Artist - Song (feat. Someone)"),
+    ("Artist - Song (Live (Official Video))", None, "Artist - Song )"),
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLx", "dQw4w9WgXcQ", ""),
+    ("https://youtu.be/dQw4w9WgXcQ?t=42", "dQw4w9WgXcQ", ""),
+    ("Rick Astley - Never Gonna Give You Up https://music.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", "Rick Astley - Never Gonna Give You Up"),
+    ("   lots    of     spaces   ", None, "lots of spaces"),
+    ("(" * 50, None, "(" * 50),
+]
+
+CURL_CASE = (
+    'curl "https://music.youtube.com/youtubei/v1/browse" ^\n'
+    '  -H "accept: */*" ^\n'
+    '  -H "authorization: SAPISIDHASH 1700000000_abc" ^\n'
+    '  -H "x-goog-authuser: 0" ^\n'
+    '  -b "SID=abc%3D; HSID=def%3B" ^\n'
+    '  --data-raw "{}"'
+)
+CURL_EXPECTED = {
+    "accept": "*/*",
+    "authorization": "SAPISIDHASH 1700000000_abc",
+    "x-goog-authuser": "0",
+    "cookie": "SID=abc=; HSID=def;",
+}
+
+
+# ==========================================
+# 🏭 CORPUS
+# ==========================================
+def _word(rng, lo=3, hi=10):
+    return "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(lo, hi)))
+
+def _name(rng, words=(1, 3)):
+    return " ".join(_word(rng).capitalize() for _ in range(rng.randint(*words)))
+
+def _video_id(rng):
+    return "".join(rng.choice(string.ascii_letters + string.digits + "-_") for _ in range(11))
+
+def gen_spotify(rng, n):
+    """Spotify desktop/web copies: plain pairs, track links, tab-separated rows."""
+    lines = []
+    for _ in range(n):
+        artist, title = _name(rng), _name(rng, (1, 5))
+        kind = rng.randrange(4)
+        if kind == 0:
+            lines.append(f"{artist} - {title}")
+        elif kind == 1:
+            track = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(22))
+            lines.append(f"https://open.spotify.com/track/{track}?si={_word(rng, 16, 16)}")
+        elif kind == 2:
+            lines.append(f"{title}\t{artist}\t{_name(rng)}\t{rng.randint(1, 9)}:{rng.randint(0, 59):02d}")
+        else:
+            lines.append(f"{artist} – {title} - Remastered {rng.randint(1970, 2024)}")
+    return lines
+
+def gen_numbered(rng, n):
+    """Numbered lists from chat/forum posts with metadata junk and timestamps."""
+    junk = ["(Official Video)", "[Official Audio]", "(Lyrics)", "[HD]", "(Visualizer)",
+            "(Remastered 2009)", "(Live)", "(feat. " + _name(rng) + ")", ""]
+    lines = []
+    for i in range(1, n + 1):
+        sep = rng.choice([". ", ") ", "- ", "."])
+        stamp = rng.choice(["", f" [{rng.randint(1, 9)}:{rng.randint(0, 59):02d}]", f" ({rng.randint(1, 9)}:{rng.randint(0, 59):02d})"])
+        lines.append(f"{i}{sep}{_name(rng)} - {_name(rng, (1, 5))} {rng.choice(junk)}{stamp}")
+    return lines
+
+def gen_urls(rng, n):
+    """URL-heavy dumps: YouTube/YT Music links with query strings, mixed with text."""
+    lines = []
+    for _ in range(n):
+        vid = _video_id(rng)
+        kind = rng.randrange(5)
+        if kind == 0:
+            lines.append(f"https://www.youtube.com/watch?v={vid}&list=PL{_word(rng, 30, 32)}&index={rng.randint(1, 99)}")
+        elif kind == 1:
+            lines.append(f"https://youtu.be/{vid}?t={rng.randint(1, 300)}")
+        elif kind == 2:
+            lines.append(f"{_name(rng)} - {_name(rng)} https://music.youtube.com/watch?v={vid}&feature=share")
+        elif kind == 3:
+            lines.append(f"check this out!! https://example.com/{_word(rng)}/{_word(rng)}?ref={_word(rng)} {_name(rng)}")
+        else:
+            lines.append(f"https://www.youtube.com/shorts/{vid}")
+    return lines
+
+def gen_adversarial(rng, n):
+    """Long and pathological lines that have tripped backtracking regexes before."""
+    makers = [
+        lambda: "(" * rng.randint(2000, 10000),
+        lambda: "[" * rng.randint(2000, 10000) + "official",
+        lambda: "(official " * rng.randint(500, 2000),
+        lambda: "([" * rng.randint(1000, 5000) + ")",
+        lambda: "(a)" * rng.randint(1000, 3000),
+        lambda: _name(rng, (500, 1500)),
+        lambda: "1" * rng.randint(2000, 8000) + ".",
+        lambda: "[1:" * rng.randint(1000, 3000),
+        lambda: "v=" * rng.randint(2000, 5000),
+        lambda: "/" * rng.randint(5000, 20000),
+        lambda: "http" + "x" * rng.randint(5000, 20000),
+        lambda: " \t" * rng.randint(2000, 8000) + "song",
+    ]
+    return [makers[i % len(makers)]() for i in range(n)]
+
+def gen_curl(rng, n):
+    """Copy-as-cURL commands, including Windows ^ escaping and broken quoting."""
+    commands = []
+    for i in range(n):
+        headers = "".join(f' ^\n  -H ^"{_word(rng)}: {_word(rng, 10, 60)}^"' for _ in range(rng.randint(10, 25)))
+        cookie = "; ".join(f"{_word(rng)}={_word(rng, 20, 60)}%3D" for _ in range(rng.randint(10, 30)))
+        if i % 4 == 3:
+            # Adversarial: unterminated quotes and a huge stray header run
+            commands.append('curl "https://music.youtube.com" ' + '-H "' * rng.randint(500, 3000) + cookie)
+        else:
+            commands.append(f'curl ^"https://music.youtube.com/youtubei/v1/browse^"{headers} ^\n  -b ^"{cookie}^"')
+    return commands
+
+FORMATS = {
+    "spotify": gen_spotify,
+    "numbered": gen_numbered,
+    "urls": gen_urls,
+}
+
+
+# ==========================================
+# ⏱️ RUNNER
+# ==========================================
+def parse_line(line):
+    """The per-line work StreamForge.execute does before searching."""
+    vid = SmartParser.extract_id_from_url(line)
+    if vid:
+        return vid
+    return SmartParser.sanitize(line)
+
+def measure(func, items, repeat):
+    """
+    Return (best items/sec over `repeat` passes, worst single-item ms).
+
+    Each item's time is its fastest over all passes, so a GC pause or a
+    scheduler hiccup doesn't register as a slow line.
+    """
+    best = 0.0
+    fastest = [float("inf")] * len(items)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items:
+                func(item)
+            elapsed = time.perf_counter() - start
+            best = max(best, len(items) / elapsed if elapsed else float("inf"))
+
+            for i, item in enumerate(items):
+                t0 = time.perf_counter()
+                func(item)
+                fastest[i] = min(fastest[i], time.perf_counter() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, max(fastest, default=0.0) * 1000
+
+def check_regressions():
+    failures = []
+    for line, expected_id, expected_query in REGRESSION_CASES:
+        got_id = SmartParser.extract_id_from_url(line)
+        got_query = SmartParser.sanitize(line)
+        if got_id != expected_id or got_query != expected_query:
+            failures.append(f"{line[:50]!r}: got ({got_id!r}, {got_query!r}), "
+                            f"expected ({expected_id!r}, {expected_query!r})")
+    if parse_curl_command(CURL_CASE) != CURL_EXPECTED:
+        failures.append(f"parse_curl_command: got {parse_curl_command(CURL_CASE)!r}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartParser throughput benchmark")
+    parser.add_argument("--lines", type=int, default=20000, help="Lines per regular format")
+    parser.add_argument("--adversarial", type=int, default=60, help="Number of adversarial lines")
+    parser.add_argument("--curl", type=int, default=40, help="Number of curl commands")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per format (best is kept)")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpora = {name: gen(rng, args.lines) for name, gen in FORMATS.items()}
+    corpora["adversarial"] = gen_adversarial(rng, args.adversarial)
+
+    failures = check_regressions()
+
+    print(f"{'format':<12} {'lines':>7} {'lines/sec':>12} {'worst ms':>9}   status")
+    print("-" * 52)
+    results = [(name, parse_line, items) for name, items in corpora.items()]
+    results.append(("curl", parse_curl_command, gen_curl(rng, args.curl)))
+    for name, func, items in results:
+        rate, worst = measure(func, items, args.repeat)
+        ok = rate >= MIN_LINES_PER_SEC[name] and worst <= MAX_LINE_MS[name]
+        print(f"{name:<12} {len(items):>7} {rate:>12,.0f} {worst:>9.2f}   {'ok' if ok else 'FAIL'}")
+        if rate < MIN_LINES_PER_SEC[name]:
+            failures.append(f"{name}: {rate:,.0f} lines/sec < {MIN_LINES_PER_SEC[name]:,}")
+        if worst > MAX_LINE_MS[name]:
+            failures.append(f"{name}: worst line {worst:.2f} ms > {MAX_LINE_MS[name]} ms")
+
+    print("-" * 52)
+    if failures:
+        print("FAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"All checks passed ({len(REGRESSION_CASES) + 1} regression cases).")
+
+if __name__ == "__main__":
+    main()
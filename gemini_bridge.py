@@ -2,10 +2,16 @@
 Gemini CLI Bridge - Integration layer for AI-powered recommendations
 """
 import subprocess
+import threading
+import signal
 import json
+import os
 import re
 import shutil
-from typing import Optional
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
 
 
 def find_gemini_cli() -> Optional[str]:
@@ -17,7 +23,7 @@ def find_gemini_cli() -> Optional[str]:
     return None
 
 
-def call_gemini(prompt: str, timeout: int = 60) -> str:
+def call_gemini(prompt: str, timeout: float = 60) -> str:
     """
     Call gemini-cli with a prompt and return the response.
     
@@ -39,7 +45,7 @@ def call_gemini(prompt: str, timeout: int = 60) -> str:
             capture_output=True,
             text=True,
             timeout=timeout,
-            shell=True  # Needed for Windows
+            shell=(os.name == "nt")  # npx is a .cmd shim on Windows
         )
         
         if result.returncode != 0:
@@ -52,50 +58,184 @@ def call_gemini(prompt: str, timeout: int = 60) -> str:
         return f"Error: {str(e)}"
 
 
-def get_song_recommendations(query: str, prompt_type: str = "similar") -> list[str]:
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill a shell-launched process along with the CLI it spawned."""
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    proc.kill()
+
+
+def stream_gemini(prompt: str, timeout: int = 60) -> Iterator[str]:
     """
-    Get song recommendations from Gemini.
-    
+    Call gemini-cli with a prompt and yield response lines as they arrive.
+
     Args:
-        query: The artist, song, or mood to base recommendations on
-        prompt_type: One of "similar", "mood", "discover"
-        
+        prompt: The prompt to send to Gemini
+        timeout: Timeout in seconds for the whole response
+
+    Yields:
+        Raw response lines; a final "Error: ..." line if the call fails
+    """
+    cli = find_gemini_cli()
+    if not cli:
+        yield "Error: gemini-cli not found. Install with: npm install -g @google/gemini-cli"
+        return
+
+    # stderr goes to a file: a pipe nobody reads until stdout hits EOF
+    # would fill up and stall a chatty npx
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr:
+        try:
+            proc = subprocess.Popen(
+                [cli, "@google/gemini-cli", "--prompt", prompt],
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                bufsize=1,  # Line buffered so songs surface as they are generated
+                shell=(os.name == "nt"),  # npx is a .cmd shim on Windows
+                start_new_session=(os.name == "posix")
+            )
+        except Exception as e:
+            yield f"Error: {str(e)}"
+            return
+
+        # Kill the process if it overruns; the read loop below then sees EOF
+        timed_out = threading.Event()
+
+        def _expire():
+            timed_out.set()
+            _kill_tree(proc)
+
+        timer = threading.Timer(timeout, _expire)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                yield line.rstrip("\n")
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                # Consumer stopped early
+                _kill_tree(proc)
+                proc.wait()
+            proc.stdout.close()
+
+        if timed_out.is_set():
+            yield "Error: Request timed out"
+        elif proc.returncode != 0:
+            stderr.seek(0)
+            yield f"Error: {stderr.read() or 'Unknown error'}"
+
+
+def build_prompt(query: str, prompt_type: str = "similar") -> str:
+    """
+    Build the Gemini prompt for a recommendation request.
+
+    Args:
+        query: The artist, song, mood, or description to base recommendations on
+        prompt_type: One of "similar", "mood", "discover", "custom"
+
     Returns:
-        List of song strings in "Artist - Song Title" format
+        The prompt text
     """
     prompts = {
-        "similar": f"""Suggest 10 songs similar to "{query}". 
+        "similar": f"""Suggest 10 songs similar to "{query}".
 Format: One song per line as "Artist - Song Title" with no numbering or extra text.
 Only output the song list, nothing else.""",
-        
+
         "mood": f"""Create a playlist of 10 songs for this mood/activity: "{query}".
 Format: One song per line as "Artist - Song Title" with no numbering or extra text.
 Only output the song list, nothing else.""",
-        
+
         "discover": f"""Suggest 10 new artists similar to "{query}" with one of their best songs.
 Format: One song per line as "Artist - Song Title" with no numbering or extra text.
+Only output the song list, nothing else.""",
+
+        "custom": f"""Based on this description: "{query}"
+Create a playlist of 15 songs that match this vibe.
+Format: One song per line as "Artist - Song Title" with no numbering or extra text.
 Only output the song list, nothing else."""
     }
+
+    return prompts.get(prompt_type, prompts["similar"])
+
+
+def parse_song_line(line: str) -> Optional[str]:
+    """
+    Parse one line of model output into "Artist - Song Title".
+
+    Returns:
+        The cleaned song string, or None if the line is not a song
+    """
+    line = line.strip()
+    # Skip empty lines and lines that look like metadata
+    if not line:
+        return None
+    # Remove common prefixes like "1.", "- ", etc.
+    line = re.sub(r'^[\d]+[\.\)\-]\s*', '', line)
+    line = re.sub(r'^[\-\*]\s*', '', line)
+    if line and " - " in line:
+        return line
+    return None
+
+
+def _parse_songs(response: str) -> list[str]:
+    """
+    Parse a full model response into its song lines.
+
+    Returns:
+        Song strings in "Artist - Song Title" format, in response order
+    """
+    songs = []
+    for line in response.split("\n"):
+        song = parse_song_line(line)
+        if song:
+            songs.append(song)
+    return songs
+
+
+def stream_song_recommendations(query: str, prompt_type: str = "similar") -> Iterator[str]:
+    """
+    Stream song recommendations from Gemini as they are generated.
+
+    Args:
+        query: The artist, song, mood, or description to base recommendations on
+        prompt_type: One of "similar", "mood", "discover", "custom"
+
+    Yields:
+        Song strings in "Artist - Song Title" format, or a single
+        "Error: ..." string if the call fails
+    """
+    for line in stream_gemini(build_prompt(query, prompt_type)):
+        if line.startswith("Error:"):
+            yield line
+            return
+        song = parse_song_line(line)
+        if song:
+            yield song
+
+
+def get_song_recommendations(query: str, prompt_type: str = "similar") -> list[str]:
+    """
+    Get song recommendations from Gemini.
     
-    prompt = prompts.get(prompt_type, prompts["similar"])
+    Args:
+        query: The artist, song, or mood to base recommendations on
+        prompt_type: One of "similar", "mood", "discover"
+        
+    Returns:
+        List of song strings in "Artist - Song Title" format
+    """
+    prompt = build_prompt(query, prompt_type)
     response = call_gemini(prompt)
     
     if response.startswith("Error:"):
         return [response]
     
-    # Parse response into list of songs
-    songs = []
-    for line in response.split("\n"):
-        line = line.strip()
-        # Skip empty lines and lines that look like metadata
-        if not line:
-            continue
-        # Remove common prefixes like "1.", "- ", etc.
-        line = re.sub(r'^[\d]+[\.\)\-]\s*', '', line)
-        line = re.sub(r'^[\-\*]\s*', '', line)
-        if line and " - " in line:
-            songs.append(line)
-    
+    songs = _parse_songs(response)
     return songs if songs else ["No recommendations found"]
 
 
@@ -109,24 +249,83 @@ def get_playlist_suggestions(description: str) -> list[str]:
     Returns:
         List of song strings
     """
-    prompt = f"""Based on this description: "{description}"
-Create a playlist of 15 songs that match this vibe.
-Format: One song per line as "Artist - Song Title" with no numbering or extra text.
-Only output the song list, nothing else."""
-
-    response = call_gemini(prompt)
+    response = call_gemini(build_prompt(description, "custom"))
     
     if response.startswith("Error:"):
         return [response]
     
-    songs = []
-    for line in response.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        line = re.sub(r'^[\d]+[\.\)\-]\s*', '', line)
-        line = re.sub(r'^[\-\*]\s*', '', line)
-        if line and " - " in line:
-            songs.append(line)
-    
+    songs = _parse_songs(response)
     return songs if songs else ["No suggestions found"]
+
+
+def get_fanout_recommendations(
+    seeds: Iterable[str],
+    prompt_types: Iterable[str] = ("similar",),
+    deadline: float = 60,
+    max_workers: int = 4,
+) -> list[str]:
+    """
+    Run several recommendation prompts concurrently and merge the results.
+
+    Every seed is combined with every prompt type (e.g. one seed with
+    "similar", "mood" and "discover", or many seeds with "similar"). Prompts
+    still running when the deadline passes are dropped instead of failing
+    the whole request.
+
+    Args:
+        seeds: Artists, songs, moods, or descriptions to base recommendations on
+        prompt_types: Any of "similar", "mood", "discover", "custom"
+        deadline: Overall time budget in seconds
+        max_workers: Maximum number of concurrent gemini-cli processes
+
+    Returns:
+        Deduplicated song strings, interleaved across prompts
+    """
+    jobs = [(seed, prompt_type) for seed in seeds for prompt_type in prompt_types]
+    if not jobs:
+        return ["No recommendations found"]
+
+    started = time.monotonic()
+
+    def run(seed: str, prompt_type: str) -> str:
+        # Queued prompts only get whatever is left of the overall budget
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            return "Error: Request timed out"
+        return call_gemini(build_prompt(seed, prompt_type), timeout=remaining)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs))))
+    futures = [pool.submit(run, seed, prompt_type) for seed, prompt_type in jobs]
+    wait(futures, timeout=deadline)
+    # Don't block on stragglers; their own timeout reaps the subprocess
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    errors = []
+    for future in futures:
+        if not future.done() or future.cancelled():
+            errors.append("Error: Request timed out")
+            continue
+        response = future.result()
+        if response.startswith("Error:"):
+            errors.append(response)
+            continue
+        results.append(_parse_songs(response))
+
+    # Round-robin so every prompt is represented near the top of the list
+    merged = []
+    seen = set()
+    for i in range(max((len(songs) for songs in results), default=0)):
+        for songs in results:
+            if i >= len(songs):
+                continue
+            key = re.sub(r'\s+', ' ', songs[i]).strip().lower()
+            if key not in seen:
+                seen.add(key)
+                merged.append(songs[i])
+
+    if merged:
+        return merged
+    if errors:
+        return [errors[0]]
+    return ["No recommendations found"]
@@ -0,0 +1,272 @@
+"""
+StreamForge Importers - Streaming CSV, M3U and JSON playlist readers
+"""
+import csv
+import json
+import os
+import re
+from collections import namedtuple
+
+from smart_parser import SmartParser
+
+# ==========================================
+# 📥 STRUCTURED IMPORTERS (CSV / M3U / JSON)
+# ==========================================
+# Exports from other tools already have artist/title/ID columns, so they
+# skip the SmartParser heuristics. Every importer reads its file
+# incrementally and yields one entry at a time.
+class Track(namedtuple("Track", "label query video_id")):
+    """
+    A pre-parsed entry from a structured import (CSV, M3U, JSON).
+
+    Carries either a direct video ID or an exact search query, so execute()
+    uses it as-is instead of running the SmartParser heuristics.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return self.label
+
+# Header aliases, compared case-insensitively with surrounding spaces removed
+TITLE_COLUMNS = ("track name", "title", "song", "song name", "track", "name")
+ARTIST_COLUMNS = ("artist name(s)", "artist name", "artist", "artists", "performer")
+ISRC_COLUMNS = ("isrc",)
+VIDEO_ID_COLUMNS = ("video id", "videoid", "video_id", "youtube id")
+URL_COLUMNS = ("url", "link", "youtube url", "video url", "youtube link", "uri", "track uri")
+
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".m3u": "m3u",
+    ".m3u8": "m3u",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+}
+
+def detect_format(path):
+    """Guess the import format from a file extension; None means free text."""
+    return IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+def make_track(title="", artist="", isrc="", video_id="", url=""):
+    """
+    Build a Track from structured fields.
+
+    A YouTube ID or URL wins; otherwise "Artist - Title" is the query, with
+    a bare ISRC as the last resort. Returns None if nothing is usable.
+    """
+    title, artist, isrc = title.strip(), artist.strip(), isrc.strip()
+    vid = None
+    if video_id and re.fullmatch(r'[0-9A-Za-z_-]{11}', video_id.strip()):
+        vid = video_id.strip()
+    elif url and "youtu" in url:
+        # Other links (Spotify, Apple) have path segments that look like IDs
+        vid = SmartParser.extract_id_from_url(url)
+
+    query = None
+    if title:
+        query = f"{artist} - {title}" if artist else title
+    elif isrc:
+        query = isrc
+
+    if not vid and not query:
+        return None
+    return Track(label=query or url or vid, query=query, video_id=vid)
+
+def _first_artist(artists):
+    """Exportify and most JSON exports list artists together; keep the lead."""
+    if isinstance(artists, list):
+        artists = artists[0] if artists else ""
+        if isinstance(artists, dict):
+            artists = artists.get("name", "")
+    return str(artists or "").split(",")[0]
+
+def _pick(row, columns):
+    for column in columns:
+        value = row.get(column)
+        if value:
+            return value if isinstance(value, (str, list, dict)) else str(value)
+    return ""
+
+def iter_csv(path):
+    """Yield Tracks from a CSV/TSV export with a header row."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if not header:
+            return
+        header = [column.strip().lower() for column in header]
+        for values in reader:
+            row = dict(zip(header, values))
+            track = make_track(
+                title=_pick(row, TITLE_COLUMNS),
+                artist=_first_artist(_pick(row, ARTIST_COLUMNS)),
+                isrc=_pick(row, ISRC_COLUMNS),
+                video_id=_pick(row, VIDEO_ID_COLUMNS),
+                url=_pick(row, URL_COLUMNS),
+            )
+            if track:
+                yield track
+
+def iter_m3u(path):
+    """
+    Yield entries from an M3U/M3U8 playlist.
+
+    YouTube URLs become direct IDs and #EXTINF titles become exact queries.
+    Bare local file paths fall back to their (sanitized) file name.
+    """
+    extinf = None
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#EXTINF:"):
+                # #EXTINF:<duration> [attributes],<Artist - Title>
+                extinf = line.split(",", 1)[1].strip() if "," in line else None
+                continue
+            if line.startswith("#"):
+                continue
+
+            vid = SmartParser.extract_id_from_url(line) if "youtu" in line else None
+            if vid or extinf:
+                yield Track(label=extinf or line, query=extinf, video_id=vid)
+            else:
+                name = os.path.splitext(os.path.basename(line.replace("\\", "/")))[0]
+                if name:
+                    yield name
+            extinf = None
+
+def _track_from_json(item):
+    if isinstance(item, str):
+        return item if item.strip() else None
+    if not isinstance(item, dict):
+        return None
+    row = {str(key).strip().lower(): value for key, value in item.items()}
+    # Spotify API dumps nest the track under "track"
+    if isinstance(row.get("track"), dict):
+        return _track_from_json(row["track"])
+    external = row.get("external_ids") if isinstance(row.get("external_ids"), dict) else {}
+    return make_track(
+        title=str(_pick(row, TITLE_COLUMNS) or ""),
+        artist=_first_artist(_pick(row, ARTIST_COLUMNS)),
+        isrc=str(_pick(row, ISRC_COLUMNS) or external.get("isrc", "")),
+        video_id=str(_pick(row, VIDEO_ID_COLUMNS) or ""),
+        url=str(_pick(row, URL_COLUMNS) or ""),
+    )
+
+# Keys holding the track list in a wrapper object, possibly nested
+# (Spotify API: {"tracks": {"items": [...]}})
+WRAPPER_KEYS = ("tracks", "items", "songs", "playlist")
+
+def _unwrap_tracks(value):
+    """Return the track list inside a wrapper object, or None if it isn't one."""
+    for key in WRAPPER_KEYS:
+        inner = value.get(key)
+        if isinstance(inner, list):
+            return inner
+        if isinstance(inner, dict):
+            nested = _unwrap_tracks(inner)
+            if nested is not None:
+                return nested
+    return None
+
+def _iter_json_values(f, chunk_size=65536):
+    """
+    Yield the elements of a top-level JSON array, or each value of a JSON
+    Lines file, decoding from a rolling buffer instead of loading it all.
+    A {"tracks": [...]} wrapper object has to be decoded whole.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    in_array = None
+    eof = False
+    # Doubles while one value keeps straddling reads, so a huge value is
+    # re-decoded O(log n) times rather than once per chunk
+    read_size = chunk_size
+
+    while True:
+        # Skip separators between values
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+        if pos >= len(buf):
+            return
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+                continue
+        if in_array and buf[pos] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Value straddles the chunk boundary; keep the tail and read more
+            more = f.read(read_size)
+            read_size *= 2
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        if end == len(buf) and not eof:
+            # A number (or literal) at the very end may continue in the next chunk
+            more = f.read(read_size)
+            read_size *= 2
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        read_size = chunk_size
+        tracks = _unwrap_tracks(value) if not in_array and isinstance(value, dict) else None
+        if tracks is not None:
+            # {"name": ..., "tracks": [...]} style wrapper around the list
+            yield from tracks
+        else:
+            yield value
+        pos = end
+
+def iter_json(path):
+    """Yield entries from a JSON array, JSON Lines file or {"tracks": [...]} wrapper."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for item in _iter_json_values(f):
+            entry = _track_from_json(item)
+            if entry:
+                yield entry
+
+IMPORTERS = {
+    "csv": iter_csv,
+    "m3u": iter_m3u,
+    "json": iter_json,
+}
+
+def iter_entries(path, fmt=None):
+    """
+    Stream entries from a file for StreamForge.execute.
+
+    Args:
+        path: File to read
+        fmt: "csv", "m3u", "json" or "text"; detected from the extension if None
+
+    Yields:
+        Track entries for structured formats, raw lines for free text
+    """
+    fmt = fmt or detect_format(path) or "text"
+    if fmt in IMPORTERS:
+        yield from IMPORTERS[fmt](path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from f
@@ -2,11 +2,16 @@
 """
 Native Messaging Host for StreamForge Keymaster.
 Receives auth headers from the extension and saves them securely.
+
+Works with both chrome.runtime.sendNativeMessage (one message, then Chrome
+closes stdin) and a persistent chrome.runtime.connectNative port, where the
+host keeps serving messages until the extension disconnects.
 """
 import sys
 import json
 import struct
 import os
+import tempfile
 
 def get_secure_path():
     """Get the secure auth file path in user's home directory."""
@@ -14,14 +19,40 @@ def get_secure_path():
     os.makedirs(config_dir, exist_ok=True)
     return os.path.join(config_dir, "streamforge_auth.json")
 
+def write_auth(headers, path):
+    """Atomically replace the auth file so readers never see a partial write."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".auth-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(headers, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_exact(n):
+    """Read exactly n bytes from stdin, or None on EOF."""
+    data = b''
+    while len(data) < n:
+        chunk = sys.stdin.buffer.read(n - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
 def read_message():
     """Read a message from the extension."""
-    raw_length = sys.stdin.buffer.read(4)
+    raw_length = read_exact(4)
     if not raw_length:
         return None
     message_length = struct.unpack('=I', raw_length)[0]
-    message = sys.stdin.buffer.read(message_length).decode('utf-8')
-    return json.loads(message)
+    message = read_exact(message_length)
+    if message is None:
+        return None
+    return json.loads(message.decode('utf-8'))
 
 def send_message(message):
     """Send a message back to the extension."""
@@ -30,19 +61,32 @@ def send_message(message):
     sys.stdout.buffer.write(encoded)
     sys.stdout.buffer.flush()
 
-def main():
-    message = read_message()
-    if message and message.get('action') == 'save_auth':
+def handle_message(message):
+    """Handle one request and return the response."""
+    action = message.get('action') if isinstance(message, dict) else None
+    if action == 'save_auth':
         try:
             headers = message.get('headers', {})
             path = get_secure_path()
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(headers, f, indent=2)
-            send_message({'success': True, 'path': path})
+            write_auth(headers, path)
+            return {'success': True, 'path': path}
         except Exception as e:
-            send_message({'success': False, 'error': str(e)})
-    else:
-        send_message({'success': False, 'error': 'Invalid message'})
+            return {'success': False, 'error': str(e)}
+    if action == 'ping':
+        return {'success': True}
+    return {'success': False, 'error': 'Invalid message'}
+
+def main():
+    while True:
+        try:
+            message = read_message()
+        except ValueError:
+            # Malformed JSON; answer and keep the session alive
+            send_message({'success': False, 'error': 'Invalid message'})
+            continue
+        if message is None:
+            break
+        send_message(handle_message(message))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,176 @@
+"""
+StreamForge Run History - SQLite log of every execute() run
+"""
+import sqlite3
+
+# ==========================================
+# 📜 RUN HISTORY
+# ==========================================
+# One row per resolved line of every run, so the lines that keep missing or
+# costing extra requests can be found across runs.
+
+# Where each line's answer came from (code = position); ResultStore keeps
+# the same codes
+RESULT_SOURCES = ("", "direct", "cache", "song", "video", "miss")
+SOURCE_CODES = {source: code for code, source in enumerate(RESULT_SOURCES)}
+# Older runs are pruned when a new one is recorded
+HISTORY_MAX_RUNS = 500
+# Sources that cost at least one search request
+NETWORK_SOURCES = ("song", "video", "miss")
+
+class RunHistory:
+    """
+    SQLite log of execute() runs in ~/.streamforge/history.db.
+
+    Query text is stored once in its own table and sources as the small
+    RESULT_SOURCES codes, so a run adds a few dozen bytes per line. For direct
+    IDs the "query" is the video ID itself. Only the newest HISTORY_MAX_RUNS
+    runs, and the queries they mention, are kept.
+
+    This is also where search scheduling learns which queries are expensive
+    (see search_costs).
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        started REAL NOT NULL,
+        duration REAL NOT NULL,
+        title TEXT,
+        lines INTEGER NOT NULL,
+        playlist_id TEXT,
+        cancelled INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS queries (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS searches (
+        run_id INTEGER NOT NULL,
+        query_id INTEGER NOT NULL,
+        source INTEGER NOT NULL,
+        found INTEGER NOT NULL,
+        latency REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS searches_run ON searches (run_id);
+    CREATE INDEX IF NOT EXISTS searches_query ON searches (query_id);
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        # A connection per call: execute() may run on any thread
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    def record(self, title, started, duration, lines, playlist_id, cancelled, rows):
+        """
+        Store one run. rows yields (query, source, found, latency secs) for
+        every line that got an answer; source is a RESULT_SOURCES name.
+
+        Returns the run ID.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                run_id = conn.execute(
+                    "INSERT INTO runs (started, duration, title, lines, playlist_id, cancelled) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (started, duration, title, lines, playlist_id, int(cancelled))).lastrowid
+                # Stage the rows, then resolve query IDs in two set-based statements
+                conn.execute("CREATE TEMP TABLE staging (query TEXT, source INTEGER, found INTEGER, latency REAL)")
+                conn.executemany("INSERT INTO staging VALUES (?, ?, ?, ?)",
+                                 ((query, SOURCE_CODES[source], int(found), latency)
+                                  for query, source, found, latency in rows))
+                conn.execute("INSERT OR IGNORE INTO queries (text) SELECT DISTINCT query FROM staging")
+                conn.execute("INSERT INTO searches SELECT ?, q.id, s.source, s.found, s.latency "
+                             "FROM staging s JOIN queries q ON q.text = s.query", (run_id,))
+                conn.execute("DROP TABLE staging")
+                pruned = conn.execute("DELETE FROM runs WHERE id <= ?",
+                                      (run_id - HISTORY_MAX_RUNS,)).rowcount
+                if pruned:
+                    conn.execute("DELETE FROM searches WHERE run_id <= ?", (run_id - HISTORY_MAX_RUNS,))
+                    conn.execute("DELETE FROM queries WHERE NOT EXISTS "
+                                 "(SELECT 1 FROM searches WHERE query_id = queries.id)")
+        finally:
+            conn.close()
+        return run_id
+
+    def search_costs(self, queries):
+        """
+        Expected search requests for the given queries, from past runs.
+
+        Returns {query: 1 + share of its network searches that needed the
+        videos fallback or missed} for queries that have been searched
+        before; anything else is absent.
+        """
+        net = tuple(SOURCE_CODES[source] for source in NETWORK_SOURCES)
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TEMP TABLE wanted (text TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((query,) for query in queries))
+            return dict(conn.execute(
+                "SELECT q.text, 1.0 + SUM(s.source != ?) * 1.0 / COUNT(*) "
+                "FROM wanted w JOIN queries q ON q.text = w.text "
+                "JOIN searches s ON s.query_id = q.id "
+                f"WHERE s.source IN ({', '.join('?' * len(net))}) "
+                "GROUP BY q.id", (SOURCE_CODES["song"], *net)))
+        finally:
+            conn.close()
+
+    def report(self, top=10, min_misses=2):
+        """
+        Summarize every stored run.
+
+        Returns a dict with:
+          runs, lines, first, last   - run count, total lines, time span
+          sources                    - {source name: lines answered that way}
+          failing                    - [(query, tries, misses, runs)] missing
+                                       in at least min_misses runs and at
+                                       least half the time, worst first
+                                       (cache answers not counted)
+          slow                       - [(query, searches, avg secs, max secs,
+                                       fallbacks)] by average search time
+          repeat_queries, repeat_searches
+                                     - queries searched over the network in
+                                       more than one run, and the searches a
+                                       persistent cache would have saved
+        """
+        net = tuple(SOURCE_CODES[source] for source in NETWORK_SOURCES)
+        marks = ", ".join("?" * len(net))
+        conn = self._connect()
+        try:
+            runs, lines, first, last = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(lines), 0), MIN(started), MAX(started) FROM runs").fetchone()
+            sources = {RESULT_SOURCES[code]: count for code, count in conn.execute(
+                "SELECT source, COUNT(*) FROM searches GROUP BY source")}
+            # Cache answers just echo an earlier search in the same run
+            failing = conn.execute(
+                "SELECT q.text, COUNT(*), SUM(NOT s.found), "
+                "COUNT(DISTINCT CASE WHEN NOT s.found THEN s.run_id END) AS miss_runs "
+                "FROM searches s JOIN queries q ON q.id = s.query_id "
+                "WHERE s.source != ? "
+                "GROUP BY s.query_id "
+                "HAVING miss_runs >= ? AND SUM(NOT s.found) * 2 >= COUNT(*) "
+                "ORDER BY 3 DESC, 2 DESC LIMIT ?",
+                (SOURCE_CODES["cache"], min_misses, top)).fetchall()
+            slow = conn.execute(
+                "SELECT q.text, COUNT(*), AVG(s.latency), MAX(s.latency), SUM(s.source = ?) "
+                "FROM searches s JOIN queries q ON q.id = s.query_id "
+                f"WHERE s.source IN ({marks}) "
+                "GROUP BY s.query_id ORDER BY 3 DESC LIMIT ?",
+                (SOURCE_CODES["video"], *net, top)).fetchall()
+            repeat_queries, repeat_searches = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(n - 1), 0) FROM ("
+                f"SELECT COUNT(*) AS n FROM searches WHERE source IN ({marks}) "
+                "GROUP BY query_id HAVING COUNT(DISTINCT run_id) > 1)", net).fetchone()
+        finally:
+            conn.close()
+        return {
+            "runs": runs, "lines": lines, "first": first, "last": last,
+            "sources": sources, "failing": failing, "slow": slow,
+            "repeat_queries": repeat_queries, "repeat_searches": repeat_searches,
+        }
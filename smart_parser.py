@@ -0,0 +1,69 @@
+"""
+SmartParser - Cleans pasted song lines into search queries
+"""
+import re
+
+# ==========================================
+# 🧠 SMART PARSER (The Cleaning Logic)
+# ==========================================
+class SmartParser:
+    # Words that mark a bracketed group as junk, e.g. [Official Video]
+    JUNK_WORDS = re.compile(r'official|video|audio|lyrics|hq|4k|hd|remastered|visualizer', re.IGNORECASE)
+    OPEN_BRACKET = re.compile(r'[\(\[]')
+    CLOSE_BRACKET = re.compile(r'[\)\]]')
+
+    @staticmethod
+    def extract_id_from_url(text):
+        regex = r'(?:v=|\/|youtu\.be\/)([0-9A-Za-z_-]{11})'
+        match = re.search(regex, text)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def strip_junk_brackets(text):
+        """
+        Drop every (...) or [...] group that contains a junk word.
+
+        Same result as re.sub(r'[\(\[][^\)\]]*(junk)[^\)\]]*[\)\]]', '', ...) but
+        a single left-to-right pass: that regex backtracks catastrophically
+        on long runs of unclosed brackets.
+        """
+        out = []
+        pos = 0
+        while True:
+            opener = SmartParser.OPEN_BRACKET.search(text, pos)
+            if not opener:
+                break
+            closer = SmartParser.CLOSE_BRACKET.search(text, opener.end())
+            if not closer:
+                # Nothing after this point can close a group
+                break
+            if SmartParser.JUNK_WORDS.search(text, opener.start(), closer.end()):
+                out.append(text[pos:opener.start()])
+            else:
+                # Groups starting inside this one end at the same closer,
+                # so they can't contain junk either
+                out.append(text[pos:closer.end()])
+            pos = closer.end()
+        out.append(text[pos:])
+        return ''.join(out)
+
+    @staticmethod
+    def sanitize(text):
+        """
+        Intelligently removes junk like [Official Video] but keeps (Don't Fear) The Reaper.
+        """
+        # 1. Remove URLs
+        text = re.sub(r'http\S+', '', text)
+        
+        # 2. Remove Leading Numbers (1. Song)
+        text = re.sub(r'^\d+[\.\-\)]\s*', '', text)
+
+        # 3. Remove Timestamps [3:20]
+        text = re.sub(r'\[\d+:\d+\]', '', text)
+        text = re.sub(r'\(\d+:\d+\)', '', text)
+
+        # 4. Remove Metadata Keywords inside Brackets/Parens
+        text = SmartParser.strip_junk_brackets(text)
+
+        # 5. Collapse spaces
+        return re.sub(r'\s+', ' ', text).strip()
@@ -4,6 +4,18 @@ import sys
 import time
 import re
 import os
+import shutil
+import mmap
+import tempfile
+import threading
+import itertools
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from ytmusicapi import YTMusic
+
+from smart_parser import SmartParser
+from importers import Track, iter_entries
+from run_history import RunHistory, RESULT_SOURCES, SOURCE_CODES, NETWORK_SOURCES
 
 # ==========================================
 # 🎨 UI (The Hacker Vibe)
@@ -26,45 +38,9 @@ def banner():
 {BOLD}:: SOVEREIGN PLAYLIST COMPILER :: v1.0 ::{RESET}
 """)
 
-# ==========================================
-# 🧠 SMART PARSER (The Cleaning Logic)
-# ==========================================
-class SmartParser:
-    @staticmethod
-    def extract_id_from_url(text):
-        regex = r'(?:v=|\/|youtu\.be\/)([0-9A-Za-z_-]{11})'
-        match = re.search(regex, text)
-        return match.group(1) if match else None
-
-    @staticmethod
-    def sanitize(text):
-        """
-        Intelligently removes junk like [Official Video] but keeps (Don't Fear) The Reaper.
-        """
-        # 1. Remove URLs
-        text = re.sub(r'http\S+', '', text)
-        
-        # 2. Remove Leading Numbers (1. Song)
-        text = re.sub(r'^\d+[\.\-\)]\s*', '', text)
-
-        # 3. Remove Timestamps [3:20]
-        text = re.sub(r'\[\d+:\d+\]', '', text)
-        text = re.sub(r'\(\d+:\d+\)', '', text)
-
-        # 4. Remove Metadata Keywords inside Brackets/Parens
-        # This regex looks for parens containing specific "junk" words
-        junk_words = r'official|video|audio|lyrics|hq|4k|hd|remastered|visualizer'
-        text = re.sub(r'[\(\[][^\)\]]*(' + junk_words + r')[^\)\]]*[\)\]]', '', text, flags=re.IGNORECASE)
-
-        # 5. Collapse spaces
-        return re.sub(r'\s+', ' ', text).strip()
-
 # ==========================================
 # ⚙️ ENGINE
 # ==========================================
-import shutil
-from ytmusicapi import YTMusic
-
 def get_config_dir():
     """Get the secure config directory in user's home."""
     config_dir = os.path.join(os.path.expanduser("~"), ".streamforge")
@@ -75,6 +51,35 @@ def get_headers_path():
     """Get the browser headers path."""
     return os.path.join(get_config_dir(), "streamforge_auth.json")
 
+def get_id_cache_path():
+    """Get the path of the known-good/known-bad video ID cache."""
+    return os.path.join(get_config_dir(), "video_ids.json")
+
+def get_history_path():
+    """Get the path of the SQLite run history."""
+    return os.path.join(get_config_dir(), "history.db")
+
+def write_auth(headers, path):
+    """Atomically replace the auth file so a watching engine never reads a partial write."""
+    write_json_atomic(headers, path)
+
+def write_json_atomic(data, path, compact=False):
+    """Write JSON to a temp file and swap it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".sf-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            if compact:
+                json.dump(data, f, separators=(",", ":"))
+            else:
+                json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def parse_curl_command(curl_cmd):
     """Extract headers from a curl command."""
     headers = {}
@@ -160,108 +165,741 @@ def setup_browser_auth():
         if key not in headers:
             headers[key] = value
     
-    with open(headers_path, 'w') as f:
-        json.dump(headers, f, indent=2)
+    write_auth(headers, headers_path)
     
     print(f"\n{GREEN}✅ Authentication saved!{RESET}")
     print(f"   Found {len(headers)} headers including cookie.")
     return headers_path
 
-def check_downloads_for_auth():
+def check_downloads_for_auth(log=print):
     """Check if browser.json was downloaded by the extension and move it."""
     downloads_path = os.path.join(os.path.expanduser("~"), "Downloads", "streamforge_auth.json")
     if os.path.exists(downloads_path):
-        import shutil
         dest_path = get_headers_path()
-        shutil.move(downloads_path, dest_path)
-        print(f"{GREEN}✅ Found streamforge_auth.json in Downloads - moved to secure location!{RESET}")
+        # Stage next to the destination first so the swap itself is atomic
+        # even when Downloads lives on another filesystem
+        tmp_path = dest_path + ".tmp"
+        shutil.move(downloads_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+        log(f"{GREEN}✅ Found streamforge_auth.json in Downloads - moved to secure location!{RESET}")
         return True
     return False
 
+# Search requests per second across all threads (the old per-line sleep(0.1))
+SEARCH_RATE = 10.0
+# Enough concurrent searches to keep the rate budget busy despite latency
+SEARCH_WORKERS = 4
+
+class RateLimiter:
+    """Spaces requests evenly across every thread that shares it."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            slot = max(self._next, time.monotonic())
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+def run_threaded(func, items, workers):
+    """
+    Call func(item) for every item on `workers` threads.
+
+    Unlike Executor.map, items are pulled one at a time rather than all
+    submitted up front, so a million-line run doesn't hold a million
+    futures. A thread stops when func returns False.
+
+    Returns how many calls returned True.
+    """
+    items = iter(items)
+    lock = threading.Lock()
+    end = object()
+
+    def worker():
+        done = 0
+        while True:
+            with lock:
+                item = next(items, end)
+            if item is end or not func(item):
+                return done
+            done += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(lambda _: worker(), range(workers)))
+
+# Playability statuses that still let a video be added to a playlist
+PLAYABLE_STATUSES = {"OK", "LOGIN_REQUIRED", "CONTENT_CHECK_REQUIRED"}
+# How long a validation verdict is trusted before re-checking (seconds)
+ID_GOOD_TTL = 30 * 24 * 3600
+ID_BAD_TTL = 7 * 24 * 3600
+
+# Per-line outcome codes kept by ResultStore (code = position)
+RESULT_STATUSES = ("pending", "direct", "resolved", "missed", "skipped", "dropped")
+_STATUS_CODES = {status: code for code, status in enumerate(RESULT_STATUSES)}
+# Runs at least this long keep their video IDs in a memory-mapped temp file
+RESULT_SPILL_LINES = 500_000
+VIDEO_ID_LEN = 11
+
+class ResultStore:
+    """
+    Per-line results of one execute() run in ~17 bytes per line.
+
+    Video IDs sit in fixed 11-byte slots of a single buffer; statuses,
+    sources and latencies in typed arrays, so no per-line Python objects are kept.
+    With spill=True the ID buffer is a memory-mapped temp file the kernel
+    can page out. IDs that aren't 11 ASCII characters (possible from JSON
+    imports) go to a small side dict.
+    """
+    __slots__ = ("_ids", "_status", "_source", "_latency", "_odd", "_file")
+
+    def __init__(self, size, spill=False):
+        self._status = array("B", bytes(size))
+        self._source = array("B", bytes(size))
+        self._latency = array("f", bytes(4 * size))
+        self._odd = {}
+        self._file = None
+        nbytes = size * VIDEO_ID_LEN
+        if spill and nbytes:
+            self._file = tempfile.TemporaryFile(dir=get_config_dir())
+            self._file.truncate(nbytes)
+            self._ids = mmap.mmap(self._file.fileno(), nbytes)
+        else:
+            self._ids = bytearray(nbytes)
+
+    def __len__(self):
+        return len(self._status)
+
+    def set(self, index, status, video_id=None, latency=0.0, source=""):
+        self._status[index] = _STATUS_CODES[status]
+        self._source[index] = SOURCE_CODES[source]
+        self._latency[index] = latency
+        if not video_id:
+            return
+        if len(video_id) == VIDEO_ID_LEN and video_id.isascii():
+            start = index * VIDEO_ID_LEN
+            self._ids[start:start + VIDEO_ID_LEN] = video_id.encode("ascii")
+        else:
+            self._odd[index] = video_id
+
+    def status(self, index):
+        return RESULT_STATUSES[self._status[index]]
+
+    def source(self, index):
+        return RESULT_SOURCES[self._source[index]]
+
+    def latency(self, index):
+        return self._latency[index]
+
+    def video_id(self, index):
+        if index in self._odd:
+            return self._odd[index]
+        start = index * VIDEO_ID_LEN
+        raw = self._ids[start:start + VIDEO_ID_LEN]
+        # Untouched slots are all zero bytes
+        return raw.decode("ascii") if raw[0] else None
+
+    def video_ids(self):
+        """Yield every resolved video ID in input order."""
+        for index in range(len(self)):
+            vid = self.video_id(index)
+            if vid:
+                yield vid
+
+    def counts(self):
+        return {status: self._status.count(code) for status, code in _STATUS_CODES.items()}
+
+    def close(self):
+        if self._file is not None:
+            self._ids.close()
+            self._file.close()
+            self._file = None
+
 class StreamForge:
-    def __init__(self):
+    def __init__(self, watch_auth=True, quiet=False):
         headers_path = get_headers_path()
+        self.headers_path = headers_path
+        # Embedders (see AsyncStreamForge) get no console output, and errors
+        # instead of the interactive setup wizard
+        self.quiet = quiet
         
         # Check if auth is set up
         if not os.path.exists(headers_path):
+            if quiet:
+                raise FileNotFoundError(f"No auth file at {headers_path}")
             # Check if extension downloaded to Downloads folder
             if not check_downloads_for_auth():
                 setup_browser_auth()
         
         try:
             self.yt = YTMusic(headers_path)
-            print(f"{GREEN}🔑 Authenticated via browser headers.{RESET}")
+            self._log(f"{GREEN}🔑 Authenticated via browser headers.{RESET}")
         except Exception as e:
+            if quiet:
+                raise
             print(f"{RED}❌ Auth Error: {e}{RESET}")
             print(f"   Try deleting {CYAN}{headers_path}{RESET} and running again.")
             sys.exit(1)
 
+        # query -> videoId (or None for a miss), shared by every caller so
+        # songs resolved ahead of time (e.g. while Gemini is still streaming)
+        # don't get searched again when the playlist is compiled
+        self.cache = {}
+        self.id_cache = self._load_id_cache()
+
+        # Search scheduling: a few threads share one request budget, and
+        # the run history (needed the videos fallback? missed?) decides
+        # what gets searched last
+        self.limiter = RateLimiter(SEARCH_RATE)
+        self.search_workers = SEARCH_WORKERS
+        # query -> Event for searches on the wire, so duplicate lines and
+        # other callers wait for one request instead of sending their own
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Every execute() run, for `--report` and search scheduling
+        self.history = RunHistory(get_history_path())
+
+        # Pick up rotated keys (e.g. from the Keymaster) without a restart
+        self._auth_lock = threading.Lock()
+        self._auth_stamp = self._stat_auth()
+        self._stop_watch = threading.Event()
+        if watch_auth:
+            threading.Thread(target=self._watch_auth, daemon=True).start()
+
+    def _log(self, *args, **kwargs):
+        if not self.quiet:
+            print(*args, **kwargs)
+
+    def _stat_auth(self):
+        try:
+            st = os.stat(self.headers_path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _watch_auth(self, interval=2.0):
+        while not self._stop_watch.wait(interval):
+            # Keys re-extracted via the extension's fallback land in Downloads;
+            # moving them into place changes the stamp below
+            try:
+                check_downloads_for_auth(self._log)
+            except OSError as e:
+                self._log(f"{RED}❌ Couldn't import keys from Downloads: {e}{RESET}")
+            stamp = self._stat_auth()
+            if stamp and stamp != self._auth_stamp:
+                self.reload_auth()
+
+    def reload_auth(self):
+        """
+        Rebuild the YTMusic client from the auth file and swap it in.
+
+        Calls already in flight keep the client they started with; the old
+        client stays active if the new keys can't be loaded.
+        """
+        with self._auth_lock:
+            stamp = self._stat_auth()
+            try:
+                yt = YTMusic(self.headers_path)
+            except Exception as e:
+                self._log(f"{RED}❌ Auth reload failed, keeping current keys: {e}{RESET}")
+                self._auth_stamp = stamp
+                return False
+            self.yt = yt
+            self._auth_stamp = stamp
+        self._log(f"{GREEN}🔄 Auth file changed - reloaded keys.{RESET}")
+        return True
+
+    def close(self):
+        """Stop watching the auth file."""
+        self._stop_watch.set()
+
+    def _load_id_cache(self):
+        try:
+            with open(get_id_cache_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _check_id(self, vid):
+        """Return True/False for playable/dead, or None if the check itself failed."""
+        # Checks spend the same request budget as searches
+        self.limiter.wait()
+        try:
+            song = self.yt.get_song(vid)
+        except Exception:
+            return None
+        status = song.get("playabilityStatus", {}).get("status")
+        if status is None:
+            return None
+        return status in PLAYABLE_STATUSES
+
+    def validate_ids(self, video_ids, workers=SEARCH_WORKERS, cancel=None, on_check=None):
+        """
+        Check direct video IDs concurrently before they reach create_playlist.
+
+        Each check goes through the shared rate limiter, so a long list of
+        links is paced like searches rather than sent in one burst.
+
+        cancel is an optional threading.Event; once set, no further checks
+        start and unchecked IDs are assumed good. on_check, if given, is
+        called from worker threads as on_check(video_id, ok, checked, total)
+        after each network check (ok is None if the check itself failed).
+
+        Verdicts are cached in ~/.streamforge/video_ids.json until they
+        expire (ID_GOOD_TTL / ID_BAD_TTL), then dropped. IDs whose check
+        fails (network error, unexpected response) are given the benefit of
+        the doubt and not cached.
+
+        Returns the set of IDs known to be dead or unplayable.
+        """
+        now = time.time()
+        bad = set()
+        to_check = []
+        for vid in set(video_ids):
+            entry = self.id_cache.get(vid)
+            if entry:
+                ttl = ID_GOOD_TTL if entry["ok"] else ID_BAD_TTL
+                if now - entry["checked"] < ttl:
+                    if not entry["ok"]:
+                        bad.add(vid)
+                    continue
+            to_check.append(vid)
+
+        if to_check:
+            self._log(f"   🩺 {CYAN}Validating {len(to_check)} direct IDs...{RESET}")
+            verdicts = {}
+            checked = itertools.count(1)
+
+            def check(vid):
+                if cancel is not None and cancel.is_set():
+                    return False
+                ok = verdicts[vid] = self._check_id(vid)
+                if on_check:
+                    on_check(vid, ok, next(checked), len(to_check))
+                return True
+
+            run_threaded(check, to_check, workers)
+            for vid, ok in verdicts.items():
+                if ok is None:
+                    continue
+                self.id_cache[vid] = {"ok": ok, "checked": now}
+                if not ok:
+                    bad.add(vid)
+            # Expired verdicts would be re-checked anyway; don't carry them
+            self.id_cache = {
+                vid: entry for vid, entry in self.id_cache.items()
+                if now - entry["checked"] < (ID_GOOD_TTL if entry["ok"] else ID_BAD_TTL)
+            }
+            try:
+                write_json_atomic(self.id_cache, get_id_cache_path(), compact=True)
+            except OSError:
+                pass
+
+        return bad
+
+    @staticmethod
+    def _classify(line):
+        """Return (direct video ID, search query) for a text line or Track."""
+        if isinstance(line, Track):
+            return line.video_id, line.query
+        vid = SmartParser.extract_id_from_url(line)
+        # Text around a link is only needed if the ID turns out to be dead
+        return vid, (None if vid else SmartParser.sanitize(line))
+
+    @classmethod
+    def _classify_all(cls, raw_lines):
+        """Drop blank lines; return (lines, [(direct ID, query) per line])."""
+        lines = [line for line in raw_lines if isinstance(line, Track) or line.strip()]
+        return lines, [cls._classify(line) for line in lines]
+
+    def _triage(self, lines, entries, bad_ids):
+        """
+        Settle every line that needs no request; shared by execute() and
+        AsyncStreamForge so both classify lines the same way.
+
+        Yields (index, line label, status, video ID, query) with status:
+          "direct"              - a live direct ID
+          "dropped"             - a dead ID with nothing to search instead
+                                  (video ID is the dead ID)
+          "skipped"             - nothing searchable
+          "resolved" / "missed" - answered from the cache
+          None                  - needs a search for query; video ID is the
+                                  dead ID it replaces, if any
+
+        entries[index] is updated to (dead ID or None, query) for lines that
+        need a search.
+        """
+        for index, (entry, (vid_id, clean_q)) in enumerate(zip(lines, entries)):
+            line = str(entry)
+            if vid_id in bad_ids:
+                # Fall back to whatever text surrounds the dead link; a
+                # Track's label is just the ID when it has no query
+                if clean_q is None and not isinstance(entry, Track):
+                    clean_q = SmartParser.sanitize(line)
+                if clean_q:
+                    entries[index] = (vid_id, clean_q)
+                    yield index, line, None, vid_id, clean_q
+                else:
+                    yield index, line, "dropped", vid_id, None
+            elif vid_id:
+                yield index, line, "direct", vid_id, None
+            elif not clean_q:
+                yield index, line, "skipped", None, None
+            elif clean_q in self.cache:
+                vid = self.cache[clean_q]
+                yield index, line, ("resolved" if vid else "missed"), vid, clean_q
+            else:
+                yield index, line, None, None, clean_q
+
     def search(self, query):
-        print(f"   🔎 Searching: {CYAN}'{query}'{RESET}...", end="\r")
+        return self.search_with_source(query)[0]
+
+    def search_with_source(self, query):
+        """
+        Search like search(), also saying where the answer came from.
+
+        Returns (video ID or None, source, latency), source being "cache",
+        "song", "video" (needed the videos fallback) or "miss", and latency
+        the seconds spent in API calls (0 for a cache hit), not counting
+        time queued behind the rate limiter.
+        """
+        if query not in self.cache:
+            self._log(f"   🔎 Searching: {CYAN}'{query}'{RESET}...", end="\r")
+        res, vid, source, latency = self._resolve(query)
+
+        if source == "cache":
+            self._log_cached(query, vid)
+            return vid, source, latency
+        
+        if res:
+            title = res['title']
+            artist = res['artists'][0]['name'] if res.get('artists') else "Unknown"
+            self._log(f"   ✅ {GREEN}Found:{RESET} {title[:30]:<30} {YELLOW}({artist}){RESET}")
+            return vid, source, latency
         
+        self._log(f"   ⚠️  {RED}No results:{RESET} '{query}'" + " "*10)
+        return None, source, latency
+
+    def _log_cached(self, query, vid):
+        if vid:
+            self._log(f"   ⚡ {GREEN}Cached:{RESET} {query[:30]:<30} {YELLOW}({vid}){RESET}")
+        else:
+            self._log(f"   ⚠️  {RED}No results (cached):{RESET} '{query}'")
+
+    def lookup(self, query):
+        """Like search(), but silent: returns the video ID or None."""
+        return self._resolve(query)[1]
+
+    def _resolve(self, query):
+        """
+        Answer one query from the cache or the API.
+
+        Concurrent callers asking for the same query (execute workers, the
+        TUI's background resolver) share one request: later callers wait
+        for the first and get its answer as a "cache" hit.
+
+        Returns (top result dict or None, video ID or None, source, API secs).
+        """
+        while True:
+            with self._inflight_lock:
+                if query in self.cache:
+                    return None, self.cache[query], "cache", 0.0
+                event = self._inflight.get(query)
+                if event is None:
+                    event = self._inflight[query] = threading.Event()
+                    break
+            # If that search fails, the loop takes over and retries it
+            event.wait()
+        try:
+            res, source, latency = self._lookup(query)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[query]
+            event.set()
+        return res, (res['videoId'] if res else None), source, latency
+
+    def _lookup(self, query):
+        """
+        Hit the API for one query, caching and recording the outcome.
+
+        Returns (top result dict or None, "song" | "video" | "miss", seconds
+        spent in the API calls themselves).
+        """
+        # One client for the whole lookup, even if keys rotate mid-search
+        yt = self.yt
         # Priority 1: Songs (High Quality)
-        res = self.yt.search(query, filter="songs", limit=1)
+        self.limiter.wait()
+        started = time.perf_counter()
+        res = yt.search(query, filter="songs", limit=1)
+        latency = time.perf_counter() - started
         # Priority 2: Videos (Coverage)
+        fallback = not res
+        if fallback:
+            self.limiter.wait()
+            started = time.perf_counter()
+            res = yt.search(query, filter="videos", limit=1)
+            latency += time.perf_counter() - started
+        
+        self.cache[query] = res[0]['videoId'] if res else None
         if not res:
-            res = self.yt.search(query, filter="videos", limit=1)
+            return None, "miss", latency
+        return res[0], ("video" if fallback else "song"), latency
+
+    def expected_costs(self, queries):
+        """
+        Expected number of search requests per query, as an array in order.
+
+        0 if it's cached; otherwise 1 plus how often it needed the videos
+        fallback or missed entirely in past runs (so at most 3), read from
+        the run history once for the whole batch.
+        """
+        queries = list(queries)
+        try:
+            history = self.history.search_costs(query for query in queries if query not in self.cache)
+        except sqlite3.Error:
+            history = {}
+        return array("f", (0 if query in self.cache else history.get(query, 1) for query in queries))
+
+    def execute(self, title, raw_lines, on_progress=None, cancel=None, partial=False, validate=True):
+        """
+        Resolve every line and create the playlist.
+
+        Free work (direct IDs, cached queries) is resolved first. Network
+        searches then run on a few threads sharing the rate limiter,
+        cheapest first, with queries that needed the videos fallback or
+        missed last time scheduled last. The playlist keeps input order.
+
+        on_progress, if given, is called with event dicts as work happens
+        (from worker threads, and not in input order):
+          {"event": "start", "lines": [...]}
+          {"event": "validate", "video_id": ..., "ok": True | False | None,
+           "checked": n, "total": n}   (direct IDs checked before searching)
+          {"event": "track", "index": i, "line": ..., "status": "direct" |
+           "resolved" | "missed" | "skipped" | "dropped", "video_id": ...,
+           "latency": secs}
+          {"event": "done", "playlist_id": ... or None, "cancelled": bool,
+           "video_ids": [...]}
+
+        cancel is an optional threading.Event; once set, no further searches
+        start. With partial=True the playlist is still created from the
+        tracks resolved so far.
+
+        Lines may be raw text or Track entries from a structured import,
+        which carry their video ID or exact query and skip SmartParser.
+
+        With validate=True, direct IDs are checked up front; dead ones are
+        re-resolved by searching the rest of their line, or dropped.
+
+        Every run, cancelled or not, is appended to the run history.
+
+        Returns the playlist ID, or None if nothing was created.
+        """
+        def emit(event, **fields):
+            if on_progress:
+                on_progress({"event": event, **fields})
+
+        started_at = time.time()
+        if not self.quiet:
+            banner()
+        self._log(f"🔨 {BOLD}Compiling:{RESET} {title}")
+        self._log("-" * 50)
         
-        if res:
-            title = res[0]['title']
-            artist = res[0]['artists'][0]['name'] if 'artists' in res[0] else "Unknown"
-            print(f"   ✅ {GREEN}Found:{RESET} {title[:30]:<30} {YELLOW}({artist}){RESET}")
-            return res[0]['videoId']
+        lines, entries = self._classify_all(raw_lines)
+        if on_progress:
+            emit("start", lines=[str(line) for line in lines])
         
-        print(f"   ⚠️  {RED}No results:{RESET} '{query}'" + " "*10)
-        return None
-
-    def execute(self, title, raw_lines):
-        banner()
-        print(f"🔨 {BOLD}Compiling:{RESET} {title}")
-        print("-" * 50)
+        # Pre-flight: one dead ID would otherwise fail the whole playlist write
+        bad_ids = set()
+        if validate:
+            bad_ids = self.validate_ids(
+                (vid for vid, _ in entries if vid), cancel=cancel,
+                on_check=lambda vid, ok, checked, total: emit(
+                    "validate", video_id=vid, ok=ok, checked=checked, total=total))
+        replaced = []
+        dropped = []
+        failed = []
         
-        final_ids = []
-        for line in raw_lines:
-            if not line.strip(): continue
-            
-            # Check URL first
-            vid_id = SmartParser.extract_id_from_url(line)
-            if vid_id:
-                final_ids.append(vid_id)
-                print(f"   📌 {CYAN}Direct ID:{RESET} {vid_id}")
+        # Outcome per line, filled in whatever order work completes
+        store = ResultStore(len(lines), spill=len(lines) >= RESULT_SPILL_LINES)
+        # Indexes of lines that need a network search
+        tasks = array("L")
+        for index, line, status, vid, query in self._triage(lines, entries, bad_ids):
+            if status is None:
+                tasks.append(index)
+                continue
+            source = "direct"
+            if status == "dropped":
+                dropped.append(vid)
+                self._log(f"   🚫 {RED}Dead ID dropped:{RESET} {vid}")
+                vid = None
+            elif status == "direct":
+                self._log(f"   📌 {CYAN}Direct ID:{RESET} {vid}")
+            elif status == "skipped":
+                source = ""
             else:
-                clean_q = SmartParser.sanitize(line)
-                if clean_q:
-                    vid = self.search(clean_q)
-                    if vid: final_ids.append(vid)
-            
-            time.sleep(0.1)
+                # Pre-resolved songs cost no request
+                self._log_cached(query, vid)
+                source = "cache"
+            store.set(index, status, vid, source=source)
+            emit("track", index=index, line=line, status=status, video_id=vid, latency=0.0)
 
-        if not final_ids:
-            print(f"\n{RED}❌ Failed. No valid tracks.{RESET}")
-            return
+        # Cheapest first; the sort is stable, so ties keep input order
+        costs = self.expected_costs(entries[index][1] for index in tasks)
+        order = sorted(range(len(tasks)), key=costs.__getitem__)
+        tasks = array("L", (tasks[j] for j in order))
+        del order, costs
+
+        def run(index):
+            if cancel is not None and cancel.is_set():
+                return False
+            # Only dead links are queued with an ID
+            dead_id, query = entries[index]
+            try:
+                vid, source, latency = self.search_with_source(query)
+            except Exception as e:
+                # One bad request shouldn't throw away the rest of the run;
+                # no source keeps it out of the history's miss counts
+                failed.append(query)
+                self._log(f"   ❌ {RED}Search failed:{RESET} '{query}' ({e})")
+                vid, source, latency = None, "", 0.0
+            if dead_id and vid:
+                replaced.append((dead_id, vid))
+                self._log(f"   🩹 {YELLOW}Dead ID {dead_id} replaced by search:{RESET} {vid}")
+                status = "resolved"
+            elif dead_id:
+                dropped.append(dead_id)
+                self._log(f"   🚫 {RED}Dead ID dropped:{RESET} {dead_id}")
+                status = "dropped"
+            else:
+                status = "resolved" if vid else "missed"
+            store.set(index, status, vid, latency, source)
+            emit("track", index=index, line=str(lines[index]), status=status,
+                 video_id=vid, latency=latency)
+            return True
+
+        done = run_threaded(run, tasks, self.search_workers) if tasks else 0
+
+        # Honoured even if nothing was left to search (all direct IDs or cached)
+        cancelled = cancel is not None and cancel.is_set()
+        if cancelled:
+            self._log(f"\n{YELLOW}⛔ Cancelled with {len(tasks) - done}/{len(lines)} searches outstanding.{RESET}")
+
+        if failed:
+            self._log(f"\n{RED}❌ {len(failed)} searches failed and were counted as missed.{RESET}")
+
+        if replaced or dropped:
+            self._log(f"\n{YELLOW}🩺 Direct IDs: {len(replaced)} replaced, {len(dropped)} dropped{RESET}")
+            for vid_id in dropped:
+                self._log(f"   - {vid_id}")
+
+        final_ids = list(store.video_ids())
+        if cancel is not None and cancel.is_set():
+            cancelled = True
+        pl_id = None
+        if not cancelled or partial:
+            pl_id = self.create(title, final_ids)
+
+        self._record_run(title, started_at, store, entries, pl_id, cancelled)
+        store.close()
+        emit("done", playlist_id=pl_id, cancelled=cancelled, video_ids=final_ids)
+        return pl_id
+
+    def _record_run(self, title, started_at, store, entries, playlist_id, cancelled):
+        """Append the finished run to the history DB; never fails the run."""
+        def rows():
+            for index, (vid_id, query) in enumerate(entries):
+                source = store.source(index)
+                if not source:
+                    continue  # skipped, or never searched before a cancel
+                found = store.status(index) in ("direct", "resolved")
+                yield (vid_id if source == "direct" else query, source, found, store.latency(index))
 
-        print("-" * 50)
         try:
-            pl_id = self.yt.create_playlist(title, "Generated via StreamForge", "PUBLIC", final_ids)
-            print(f"\n{GREEN}🔥 SUCCESS! Playlist Active.{RESET}")
-            print(f"🔗 {BOLD}Link:{RESET} https://music.youtube.com/playlist?list={pl_id}")
+            self.history.record(title, started_at, time.time() - started_at,
+                                len(entries), playlist_id, cancelled, rows())
+        except (sqlite3.Error, OSError) as e:
+            self._log(f"{YELLOW}⚠️  Run history not saved: {e}{RESET}")
+
+    def create(self, title, video_ids):
+        """Write the playlist. Returns the playlist ID, or None on failure."""
+        if not video_ids:
+            self._log(f"\n{RED}❌ Failed. No valid tracks.{RESET}")
+            return None
+
+        self._log("-" * 50)
+        try:
+            pl_id = self.yt.create_playlist(title, "Generated via StreamForge", "PUBLIC", video_ids)
+            self._log(f"\n{GREEN}🔥 SUCCESS! Playlist Active.{RESET}")
+            self._log(f"🔗 {BOLD}Link:{RESET} https://music.youtube.com/playlist?list={pl_id}")
+            return pl_id
         except Exception as e:
-            print(f"{RED}❌ API Error: {e}{RESET}")
+            self._log(f"{RED}❌ API Error: {e}{RESET}")
+            return None
 
 # ==========================================
 # 🎮 INTERFACE
 # ==========================================
+def show_report(top=10):
+    history = RunHistory(get_history_path())
+    data = history.report(top=top)
+    banner()
+    print(f"📜 {BOLD}Run History:{RESET} {history.path}")
+    print("-" * 50)
+    if not data["runs"]:
+        print(f"{YELLOW}No runs recorded yet.{RESET}")
+        return
+
+    day = lambda ts: time.strftime("%Y-%m-%d", time.localtime(ts))
+    print(f"Runs: {data['runs']} ({day(data['first'])} → {day(data['last'])}), {data['lines']:,} lines")
+    sources = data["sources"]
+    print("Answers: " + " · ".join(f"{source} {sources.get(source, 0):,}" for source in RESULT_SOURCES[1:]))
+
+    cached = sources.get("cache", 0)
+    searched = sum(sources.get(source, 0) for source in NETWORK_SOURCES)
+    if cached + searched:
+        print(f"\n⚡ {CYAN}Cache:{RESET} {cached:,}/{cached + searched:,} queries answered without a request "
+              f"({cached / (cached + searched):.0%})")
+    if searched:
+        print(f"   {sources.get('video', 0) / searched:.0%} of searches needed the videos fallback, "
+              f"{sources.get('miss', 0) / searched:.0%} found nothing")
+    if data["repeat_queries"]:
+        print(f"   {data['repeat_searches']:,} searches repeated one of {data['repeat_queries']:,} "
+              f"queries already searched in an earlier run")
+
+    if data["failing"]:
+        print(f"\n🚫 {RED}Chronically failing:{RESET}")
+        for query, tries, misses, runs in data["failing"]:
+            print(f"   {misses}/{tries} missed in {runs} runs  {YELLOW}'{query}'{RESET}")
+
+    if data["slow"]:
+        print(f"\n🐢 {YELLOW}Slowest searches:{RESET}")
+        for query, count, avg, worst, fallbacks in data["slow"]:
+            extra = f", {fallbacks} needed videos" if fallbacks else ""
+            print(f"   {avg:.2f}s avg / {worst:.2f}s max over {count}{extra}  {CYAN}'{query}'{RESET}")
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("file", nargs="?", help="Text file with song list")
+    parser.add_argument("file", nargs="?", help="Song list: text, CSV, M3U/M3U8 or JSON")
+    parser.add_argument("--format", choices=["auto", "text", "csv", "m3u", "json"], default="auto",
+                        help="Input format for FILE (default: from the extension)")
+    parser.add_argument("--report", action="store_true",
+                        help="Show failing/slow queries and cache hit rate from past runs")
+    parser.add_argument("--top", type=int, default=10, help="Rows per --report list")
     args = parser.parse_args()
+
+    if args.report:
+        show_report(args.top)
+        return
     
     app = StreamForge()
 
     # FILE MODE (For Agents)
     if args.file:
-        with open(args.file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        fmt = None if args.format == "auto" else args.format
+        lines = iter_entries(args.file, fmt)
         name = f"Forge: {os.path.basename(args.file)}"
         app.execute(name, lines)
         return
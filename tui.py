@@ -6,22 +6,29 @@ from textual.containers import Container, Horizontal, Vertical, ScrollableContai
 from textual.widgets import (
     Header, Footer, Static, Button, Input, 
     ListView, ListItem, Label, TextArea, OptionList,
-    TabbedContent, TabPane, LoadingIndicator
+    TabbedContent, TabPane, LoadingIndicator, Checkbox, DataTable
 )
 from textual.binding import Binding
 from textual.screen import Screen
+from textual.worker import get_current_worker
 from textual import work
+from rich.markup import escape
 from rich.text import Text
 from rich.panel import Panel
 
 import os
 import sys
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Iterable
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from streamforge import StreamForge, SmartParser, banner, CYAN, GREEN, YELLOW, RED, RESET
-from gemini_bridge import get_song_recommendations, get_playlist_suggestions
+from streamforge import StreamForge, SmartParser, get_headers_path, banner, CYAN, GREEN, YELLOW, RED, RESET
+from gemini_bridge import stream_song_recommendations, get_fanout_recommendations
 
 
 # ==========================================
@@ -117,6 +124,18 @@ Screen {
 LoadingIndicator {
     height: 3;
 }
+
+#progress-panel {
+    display: none;
+    height: auto;
+    border: solid $warning;
+    margin-top: 1;
+    padding: 0 1;
+}
+
+#track-table {
+    height: 15;
+}
 """
 
 
@@ -167,25 +186,205 @@ class CreatePlaylistScreen(Static):
             yield Input(placeholder="Playlist name...", id="playlist-name")
             yield Button("🔥 Create", id="btn-create-playlist", variant="primary")
         
+        with Vertical(id="progress-panel"):
+            yield Static("", id="progress-stats")
+            yield DataTable(id="track-table", cursor_type="row", zebra_stripes=True)
+            with Horizontal():
+                yield Button("⛔ Cancel", id="btn-cancel-creation", variant="error")
+                yield Button("✂️  Stop & Create", id="btn-stop-create", variant="warning")
+        
         yield Static("[dim italic]Tip: Paste your songs, then press Tab to preview[/]", classes="keyboard-hint")
     
+    def on_mount(self) -> None:
+        # line -> (kind, value), rebuilt from the previous pass on every parse
+        # so unchanged lines never hit the SmartParser regexes again
+        self._parsed = {}
+        # Parsed (kind, value) for every line of the last parse
+        self._entries = []
+        # Sanitized queries from the last parse, for background resolution
+        self._queries = []
+        self._stats = {}
+        self._parse_timer = None
+        self._resolve_timer = None
+        # Progress events from StreamForge.execute; appended from the worker
+        # thread and drained on a UI timer so bursts of cached tracks don't
+        # block the engine on call_from_thread
+        self._progress_events = deque()
+        self._progress_timer = None
+        table = self.query_one("#track-table", DataTable)
+        table.add_column("#", key="n")
+        table.add_column("Song", key="song")
+        table.add_column("Status", key="status")
+        table.add_column("Video ID", key="video_id")
+        table.add_column("Latency", key="latency")
+    
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
-        """Update preview when text changes."""
-        text = event.text_area.text
-        lines = text.split("\n")
+        """Schedule a preview refresh once typing/pasting settles."""
+        if self._parse_timer is not None:
+            self._parse_timer.stop()
+        self._parse_timer = self.set_timer(0.25, self._start_parse)
+    
+    def _start_parse(self) -> None:
+        self._parse_text(self.query_one("#song-input", TextArea).text)
+    
+    @staticmethod
+    def _parse_line(line: str) -> tuple[str, str | None]:
+        """Classify one line the same way StreamForge.execute will."""
+        if not line.strip():
+            return ("blank", None)
+        vid = SmartParser.extract_id_from_url(line)
+        if vid:
+            return ("id", vid)
+        clean = SmartParser.sanitize(line)
+        if clean:
+            return ("query", clean)
+        return ("junk", None)
+    
+    @work(exclusive=True, thread=True, group="preview")
+    def _parse_text(self, text: str) -> None:
+        """Parse the pasted text off the event loop, reusing cached lines."""
+        worker = get_current_worker()
+        previous = self._parsed
+        parsed = {}
+        entries = []
+        queries = []
+        seen = set()
+        stats = {"id": 0, "query": 0, "duplicate": 0, "blank": 0, "junk": 0}
+        
+        for i, line in enumerate(text.split("\n")):
+            if i % 2000 == 0 and worker.is_cancelled:
+                return
+            entry = parsed.get(line) or previous.get(line)
+            if entry is None:
+                entry = self._parse_line(line)
+            parsed[line] = entry
+            entries.append(entry)
+            
+            kind, value = entry
+            stats[kind] += 1
+            if value is None:
+                continue
+            if entry in seen:
+                stats["duplicate"] += 1
+            else:
+                seen.add(entry)
+            if kind == "query":
+                queries.append(value)
+        
+        self.app.call_from_thread(self._apply_parse, parsed, entries, queries, stats)
+    
+    def _apply_parse(self, parsed: dict, entries: list, queries: list[str], stats: dict) -> None:
+        self._parsed = parsed
+        self._entries = entries
+        self._queries = queries
+        self._stats = stats
+        self.update_preview()
+        
+        # Start resolving once the list has been stable for a moment
+        if self._resolve_timer is not None:
+            self._resolve_timer.stop()
+        self._resolve_timer = self.set_timer(1.0, self._resolve_pasted)
+    
+    def _resolve_pasted(self) -> None:
+        self.app.resolve_queries_in_background(self._queries)
+        self.update_preview()
+    
+    def update_preview(self) -> None:
+        """Render the first few songs with their resolution status."""
+        songs = [entry for entry in self._entries if entry[1] is not None]
         preview_lines = []
         
-        for line in lines[:5]:  # Preview first 5
-            if line.strip():
-                clean = SmartParser.sanitize(line)
-                if clean:
-                    preview_lines.append(f"  ✓ {clean}")
+        for kind, value in songs[:5]:  # Preview first 5
+            if kind == "id":
+                preview_lines.append(f"  📌 {value}")
+            else:
+                preview_lines.append(f"  • {escape(value)}{self.app.query_mark(value)}")
         
-        if len(lines) > 5:
-            preview_lines.append(f"  ... and {len(lines) - 5} more")
+        if len(songs) > 5:
+            preview_lines.append(f"  ... and {len(songs) - 5} more")
         
         preview = "\n".join(preview_lines) if preview_lines else "[dim]No songs detected[/]"
+        
+        if self._stats:
+            stats = self._stats
+            preview += (
+                f"\n[dim]{stats['id']} direct IDs · {stats['query']} searches · "
+                f"{stats['duplicate']} duplicates · {stats['blank']} blank"
+            )
+            if stats["junk"]:
+                preview += f" · {stats['junk']} unparseable"
+            preview += "[/]"
+        if self._queries:
+            resolved = self.app.count_resolved(self._queries)
+            preview += f"\n[dim]Pre-resolved {resolved}/{len(self._queries)} searches[/]"
         self.query_one("#preview-panel", Static).update(f"[bold]Preview:[/]\n{preview}")
+    
+    def start_progress(self) -> None:
+        """Show the track table and start draining progress events."""
+        self._progress_events.clear()
+        self._counts = {"resolved": 0, "missed": 0, "direct": 0, "skipped": 0, "dropped": 0}
+        self._total = 0
+        self._validation = None
+        self._started = time.monotonic()
+        self.query_one("#track-table", DataTable).clear()
+        self.query_one("#progress-stats", Static).update("[dim]Starting...[/]")
+        self.query_one("#progress-panel").display = True
+        if self._progress_timer is None:
+            self._progress_timer = self.set_interval(0.1, self._drain_progress)
+    
+    def push_progress(self, event: dict) -> None:
+        """Thread-safe progress callback for StreamForge.execute."""
+        self._progress_events.append(event)
+    
+    def _drain_progress(self) -> None:
+        table = self.query_one("#track-table", DataTable)
+        updated = False
+        while self._progress_events:
+            event = self._progress_events.popleft()
+            updated = True
+            if event["event"] == "start":
+                self._total = len(event["lines"])
+                self._started = time.monotonic()
+                for i, line in enumerate(event["lines"]):
+                    # User text is plain Text so brackets in it aren't read as markup
+                    table.add_row(i + 1, Text(line.strip()[:60]), "[dim]pending[/]", "", "", key=str(i))
+            elif event["event"] == "validate":
+                self._validation = (event["checked"], event["total"])
+            elif event["event"] == "track":
+                status = event["status"]
+                self._counts[status] += 1
+                key = str(event["index"])
+                styles = {"resolved": "[green]resolved[/]", "missed": "[red]missed[/]",
+                          "direct": "[cyan]direct[/]", "skipped": "[dim]skipped[/]",
+                          "dropped": "[red]dead ID[/]"}
+                table.update_cell(key, "status", styles[status])
+                table.update_cell(key, "video_id", Text(event["video_id"] or ""))
+                table.update_cell(key, "latency", f"{event['latency'] * 1000:.0f} ms")
+            elif event["event"] == "done":
+                self._stop_progress_timer()
+        if updated:
+            self._render_progress_stats()
+    
+    def _stop_progress_timer(self) -> None:
+        if self._progress_timer is not None:
+            self._progress_timer.stop()
+            self._progress_timer = None
+    
+    def _render_progress_stats(self) -> None:
+        counts = self._counts
+        done = sum(counts.values())
+        pending = self._total - done
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        rate = done / elapsed
+        eta = f"{pending / rate:.0f}s" if rate and pending else "-"
+        validating = ""
+        if self._validation and self._validation[0] < self._validation[1]:
+            validating = f"[cyan]🩺 checking links {self._validation[0]}/{self._validation[1]}[/] · "
+        self.query_one("#progress-stats", Static).update(
+            f"{validating}[green]{counts['resolved']} resolved[/] · [red]{counts['missed']} missed[/] · "
+            f"[cyan]{counts['direct']} direct[/] · [red]{counts['dropped']} dead IDs[/] · {pending} pending · "
+            f"{rate:.1f} tracks/s · ETA {eta}"
+        )
 
 
 # ==========================================
@@ -204,11 +403,14 @@ class RecommendationsScreen(Static):
             "🎭 Mood playlist - Create a playlist for a mood/activity", 
             "🔍 Discover artists - Find new artists similar to one you like",
             "📝 Custom prompt - Describe what you want",
+            "🎛️  Blend - Similar + mood + discover at once (comma-separate seeds)",
             id="rec-type-list"
         )
         
         yield Input(placeholder="Enter artist, song, mood, or description...", id="rec-query")
-        yield Button("✨ Get Recommendations", id="btn-get-recs", variant="primary")
+        with Horizontal():
+            yield Button("✨ Get Recommendations", id="btn-get-recs", variant="primary")
+            yield Checkbox("⚡ Resolve in background", value=True, id="rec-resolve")
         
         yield ScrollableContainer(
             Static("[dim]Recommendations will appear here...[/]", id="rec-results-text"),
@@ -217,32 +419,69 @@ class RecommendationsScreen(Static):
         
         yield Button("📋 Use These Songs", id="btn-use-songs", variant="success")
 
+    def on_mount(self) -> None:
+        self._current_songs = []
+
     @work(exclusive=True, thread=True)
-    def fetch_recommendations(self, query: str, rec_type: int) -> None:
-        """Fetch recommendations from Gemini (runs in thread)."""
-        type_map = {0: "similar", 1: "mood", 2: "discover", 3: "custom"}
+    def fetch_recommendations(self, query: str, rec_type: int, resolve: bool = False) -> None:
+        """Stream recommendations from Gemini (runs in thread).
+        
+        Songs are shown as soon as each line arrives. With ``resolve`` set,
+        every song is also queued for background resolution so the Create
+        step only has to write the playlist.
+        """
+        type_map = {0: "similar", 1: "mood", 2: "discover", 3: "custom", 4: "blend"}
         prompt_type = type_map.get(rec_type, "similar")
+        worker = get_current_worker()
         
-        if prompt_type == "custom":
-            songs = get_playlist_suggestions(query)
+        songs = []
+        error = None
+        if prompt_type == "blend":
+            # Fan out every seed x type at once; results arrive together
+            seeds = [seed.strip() for seed in query.split(",") if seed.strip()]
+            blended = get_fanout_recommendations(seeds, ("similar", "mood", "discover"))
+            source = (song for song in blended if song != "No recommendations found")
         else:
-            songs = get_song_recommendations(query, prompt_type)
+            source = stream_song_recommendations(query, prompt_type)
+        
+        for song in source:
+            if worker.is_cancelled:
+                return
+            if song.startswith("Error:"):
+                error = song
+                break
+            songs.append(song)
+            if resolve:
+                self.app.call_from_thread(self.app.resolve_in_background, [song])
+            self.app.call_from_thread(self._display_results, list(songs))
+        
+        if error and not songs:
+            songs = [error]
+        elif error:
+            self.app.call_from_thread(self.app.notify, error, severity="warning")
+        elif not songs:
+            songs = ["No recommendations found"]
         
         # Update UI from main thread
         self.app.call_from_thread(self._display_results, songs)
     
     def _display_results(self, songs: list[str]) -> None:
         """Display recommendation results."""
+        # Store songs for later use
+        self._current_songs = songs
+        self.render_results()
+    
+    def render_results(self) -> None:
+        """Render the current songs with their resolution status."""
+        songs = self._current_songs
         if songs and songs[0].startswith("Error:"):
-            result_text = f"[red]{songs[0]}[/]"
+            result_text = f"[red]{escape(songs[0])}[/]"
         else:
             result_text = "[bold green]Recommendations:[/]\n"
             for i, song in enumerate(songs, 1):
-                result_text += f"  {i}. {song}\n"
+                result_text += f"  {i}. {escape(song)}{self.app.resolution_mark(song)}\n"
         
         self.query_one("#rec-results-text", Static).update(result_text)
-        # Store songs for later use
-        self._current_songs = songs
 
 
 # ==========================================
@@ -273,6 +512,7 @@ class SettingsScreen(Static):
   [cyan]3[/]  Get Recommendations
   [cyan]4[/]  Settings
   [cyan]?[/]  Show this help
+  [cyan]x[/]  Cancel playlist creation
   [cyan]q[/]  Quit
   [cyan]↑/↓[/] or [cyan]j/k[/]  Navigate
   [cyan]Enter[/]  Select
@@ -298,6 +538,7 @@ class StreamForgeApp(App):
         Binding("3", "show_recommend", "Recommend", show=True),
         Binding("4", "show_settings", "Settings", show=True),
         Binding("?", "show_help", "Help"),
+        Binding("x", "cancel_creation", "Cancel", show=False),
         Binding("escape", "go_back", "Back"),
         Binding("j", "focus_next", "Down", show=False),
         Binding("k", "focus_previous", "Up", show=False),
@@ -307,14 +548,114 @@ class StreamForgeApp(App):
         super().__init__()
         self.current_screen = "home"
         self._forge = None
+        self._forge_lock = threading.Lock()
+        # Speculative searches for songs the user is still reviewing
+        self._resolver = ThreadPoolExecutor(max_workers=2)
+        # future -> query, for searches not yet finished
+        self._resolve_futures = {}
+        self._pending = set()
+        self._refresh_scheduled = False
+        # Set while a playlist is being compiled
+        self._creation_cancel = None
+        self._creation_partial = False
     
     @property
     def forge(self) -> StreamForge:
         """Lazy-load StreamForge engine."""
-        if self._forge is None:
-            self._forge = StreamForge()
+        with self._forge_lock:
+            if self._forge is None:
+                self._forge = StreamForge()
         return self._forge
     
+    def resolve_in_background(self, lines: list[str]) -> None:
+        """Queue songs for speculative resolution through StreamForge.search.
+        
+        Results land in the engine's query cache, so a later execute() only
+        has to write the playlist.
+        """
+        self.resolve_queries_in_background(
+            SmartParser.sanitize(line) for line in lines
+            if not SmartParser.extract_id_from_url(line)
+        )
+    
+    def resolve_queries_in_background(self, queries: Iterable[str]) -> None:
+        """Queue already-sanitized queries for speculative resolution."""
+        if self._creation_cancel is not None:
+            # Suspended while a playlist compiles: execute() searches these itself
+            return
+        if self._forge is None and not os.path.exists(get_headers_path()):
+            # Never trigger the interactive auth wizard from a background search
+            return
+        cache = self._forge.cache if self._forge is not None else {}
+        for query in queries:
+            if not query or query in cache or query in self._pending:
+                continue
+            self._pending.add(query)
+            future = self._resolver.submit(self._resolve_one, query)
+            self._resolve_futures[future] = query
+            future.add_done_callback(self._resolve_done)
+    
+    def _resolve_done(self, future) -> None:
+        query = self._resolve_futures.pop(future, None)
+        if future.cancelled():
+            # _resolve_one never ran to clear it
+            self._pending.discard(query)
+    
+    def _drop_queued_resolutions(self, cancel: threading.Event) -> None:
+        """Cancel speculative searches that haven't started; let running ones land.
+        
+        Stops waiting as soon as the creation itself is cancelled.
+        """
+        running = [future for future in list(self._resolve_futures) if not future.cancel()]
+        while running and not cancel.is_set():
+            _, not_done = wait(running, timeout=0.1)
+            running = list(not_done)
+    
+    def _resolve_one(self, query: str) -> None:
+        """Search one query (runs in the resolver pool)."""
+        try:
+            self.forge.search(query)
+        except (Exception, SystemExit):
+            pass
+        finally:
+            self._pending.discard(query)
+        self.call_from_thread(self._schedule_refresh)
+    
+    def _schedule_refresh(self) -> None:
+        # Coalesce bursts of completed searches into one repaint
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.set_timer(0.2, self._refresh_resolution)
+    
+    def _refresh_resolution(self) -> None:
+        self._refresh_scheduled = False
+        self.query_one("#screen-create", CreatePlaylistScreen).update_preview()
+        self.query_one("#screen-recommend", RecommendationsScreen).render_results()
+    
+    def resolution_mark(self, line: str) -> str:
+        """Inline status marker for a song line."""
+        if SmartParser.extract_id_from_url(line):
+            return " [cyan]📌[/]"
+        return self.query_mark(SmartParser.sanitize(line))
+    
+    def query_mark(self, query: str) -> str:
+        """Inline status marker for a sanitized search query."""
+        if self._forge is not None and query in self._forge.cache:
+            return " [green]✓[/]" if self._forge.cache[query] else " [red]✗[/]"
+        if query in self._pending:
+            return " [dim]…[/]"
+        return ""
+    
+    def count_resolved(self, queries: list[str]) -> int:
+        """How many of the given queries already have a cached result."""
+        if self._forge is None:
+            return 0
+        cache = self._forge.cache
+        return sum(1 for query in queries if query in cache)
+    
+    def on_unmount(self) -> None:
+        self._resolver.shutdown(wait=False, cancel_futures=True)
+    
     def compose(self) -> ComposeResult:
         yield Header()
         
@@ -384,6 +725,10 @@ class StreamForgeApp(App):
         # Action buttons
         elif button_id == "btn-create-playlist":
             self._create_playlist()
+        elif button_id == "btn-cancel-creation":
+            self.action_cancel_creation()
+        elif button_id == "btn-stop-create":
+            self.action_cancel_creation(partial=True)
         elif button_id == "btn-get-recs":
             self._get_recommendations()
         elif button_id == "btn-use-songs":
@@ -408,30 +753,76 @@ class StreamForgeApp(App):
             
             name = name_input.value or "StreamForge Mix"
             
+            if self._creation_cancel is not None:
+                self.notify("A playlist is already being created.", severity="warning")
+                return
+            
             self.notify(f"Creating playlist '{name}' with {len(songs)} songs...")
             
             # Run in background
-            self._execute_playlist_creation(name, songs)
+            self._creation_cancel = threading.Event()
+            self._creation_partial = False
+            create_screen = self.query_one("#screen-create", CreatePlaylistScreen)
+            create_screen.start_progress()
+            self._execute_playlist_creation(name, songs, create_screen.push_progress)
             
         except Exception as e:
             self.notify(f"Error: {e}", severity="error")
     
+    def action_cancel_creation(self, partial: bool = False) -> None:
+        """Stop outstanding searches; with partial, keep what resolved."""
+        if self._creation_cancel is None:
+            return
+        self._creation_partial = partial
+        self._creation_cancel.set()
+        self.notify("Stopping after the current search...", severity="warning")
+    
     @work(exclusive=True, thread=True)
-    def _execute_playlist_creation(self, name: str, songs: list[str]) -> None:
+    def _execute_playlist_creation(self, name: str, songs: list[str], on_progress) -> None:
         """Execute playlist creation in background thread."""
+        cancel = self._creation_cancel
         try:
-            self.forge.execute(name, songs)
-            self.app.call_from_thread(
-                self.notify, 
-                f"✅ Playlist '{name}' created successfully!",
-                severity="information"
-            )
+            # execute() searches everything itself; only searches already on
+            # the wire are worth waiting for (the engine shares them anyway)
+            self._drop_queued_resolutions(cancel)
+            
+            outcome = {}
+            
+            def progress(event: dict) -> None:
+                if event["event"] == "done":
+                    outcome.update(event)
+                on_progress(event)
+            
+            pl_id = self.forge.execute(name, songs, on_progress=progress, cancel=cancel)
+            cancelled = outcome.get("cancelled", False)
+            resolved = outcome.get("video_ids", [])
+            
+            if cancelled and self._creation_partial and resolved:
+                pl_id = self.forge.create(name, resolved)
+            
+            if pl_id:
+                self.call_from_thread(
+                    self.notify, 
+                    f"✅ Playlist '{name}' created with {len(resolved)} tracks!",
+                    severity="information"
+                )
+            elif cancelled and not self._creation_partial:
+                self.call_from_thread(self.notify, "Playlist creation cancelled.", severity="warning")
+            else:
+                self.call_from_thread(
+                    self.notify,
+                    f"❌ Playlist '{name}' was not created.",
+                    severity="error"
+                )
         except Exception as e:
-            self.app.call_from_thread(
+            on_progress({"event": "done", "playlist_id": None, "cancelled": False, "video_ids": []})
+            self.call_from_thread(
                 self.notify,
                 f"❌ Error: {e}",
                 severity="error"
             )
+        finally:
+            self._creation_cancel = None
     
     def _get_recommendations(self) -> None:
         """Get recommendations from Gemini."""
@@ -446,12 +837,13 @@ class StreamForgeApp(App):
             
             # Get selected type (default to 0)
             selected = type_list.highlighted or 0
+            resolve = self.query_one("#rec-resolve", Checkbox).value
             
             self.notify("🤖 Fetching recommendations from Gemini...")
             
             # Trigger the recommendation fetch
             rec_screen = self.query_one("#screen-recommend", RecommendationsScreen)
-            rec_screen.fetch_recommendations(query, selected)
+            rec_screen.fetch_recommendations(query, selected, resolve)
             
         except Exception as e:
             self.notify(f"Error: {e}", severity="error")